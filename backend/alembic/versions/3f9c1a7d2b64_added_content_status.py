@@ -0,0 +1,32 @@
+"""added content status
+
+Revision ID: 3f9c1a7d2b64
+Revises: 261ea6e18836
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1a7d2b64'
+down_revision: Union[str, Sequence[str], None] = '261ea6e18836'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+content_status = sa.Enum('READY', 'PENDING', name='contentstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    content_status.create(op.get_bind(), checkfirst=True)
+    op.add_column('contents', sa.Column('status', content_status, server_default='READY', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contents', 'status')
+    content_status.drop(op.get_bind(), checkfirst=True)
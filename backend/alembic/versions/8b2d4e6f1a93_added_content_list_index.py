@@ -0,0 +1,29 @@
+"""added content list index
+
+Revision ID: 8b2d4e6f1a93
+Revises: 3f9c1a7d2b64
+Create Date: 2026-10-17 11:02:17.540931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4e6f1a93'
+down_revision: Union[str, Sequence[str], None] = '3f9c1a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contents_user_created_id', 'contents',
+                    ['user_id', sa.text('created_at DESC'), 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contents_user_created_id', table_name='contents')
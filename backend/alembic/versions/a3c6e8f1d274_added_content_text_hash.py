@@ -0,0 +1,31 @@
+"""added content text hash
+
+Revision ID: a3c6e8f1d274
+Revises: f2b7d9e4c815
+Create Date: 2026-10-17 18:05:49.118730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c6e8f1d274'
+down_revision: Union[str, Sequence[str], None] = 'f2b7d9e4c815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows are hashed by `python -m commands.backfill_text_hash`
+    op.add_column('contents', sa.Column('text_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_contents_user_text_hash', 'contents', ['user_id', 'text_hash'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contents_user_text_hash', table_name='contents')
+    op.drop_column('contents', 'text_hash')
@@ -0,0 +1,62 @@
+"""added content change feed
+
+Revision ID: a8e3f1b6d294
+Revises: d7a2c5e8b416
+Create Date: 2026-10-18 09:41:18.502736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e3f1b6d294'
+down_revision: Union[str, Sequence[str], None] = 'd7a2c5e8b416'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('content_seq', sa.BigInteger(), server_default='0', nullable=False))
+    # Plain ADD COLUMN: a batch rebuild of contents would drop its search triggers on SQLite
+    op.add_column('contents', sa.Column('change_seq', sa.BigInteger(), nullable=True))
+    op.create_table('content_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('content_id', sa.String(), nullable=False),
+    sa.Column('change_seq', sa.BigInteger(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_content_tombstones_user_change_seq', 'content_tombstones', ['user_id', 'change_seq'], unique=False)
+
+    # Existing ready rows enter each user's feed oldest first. UPDATE ... FROM numbers
+    # the table in one pass (SQLite 3.33+); a correlated subquery would rerun per row
+    op.execute("""
+        UPDATE contents SET change_seq = numbered.seq
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY user_id ORDER BY created_at, id) AS seq
+            FROM contents
+            WHERE user_id IS NOT NULL AND status = 'READY'
+        ) AS numbered
+        WHERE numbered.id = contents.id
+    """)
+    op.execute("""
+        UPDATE users SET content_seq = coalesce(
+            (SELECT max(change_seq) FROM contents WHERE contents.user_id = users.id), 0
+        )
+    """)
+    op.create_index('ix_contents_user_change_seq', 'contents', ['user_id', 'change_seq'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contents_user_change_seq', table_name='contents')
+    op.drop_index('ix_content_tombstones_user_change_seq', table_name='content_tombstones')
+    op.drop_table('content_tombstones')
+    op.drop_column('contents', 'change_seq')
+    op.drop_column('users', 'content_seq')
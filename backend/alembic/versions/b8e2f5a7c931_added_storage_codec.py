@@ -0,0 +1,30 @@
+"""added storage codec
+
+Revision ID: b8e2f5a7c931
+Revises: a3c6e8f1d274
+Create Date: 2026-10-17 19:21:37.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f5a7c931'
+down_revision: Union[str, Sequence[str], None] = 'a3c6e8f1d274'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contents', sa.Column('storage_codec', sa.String(), nullable=True))
+    op.add_column('content_blobs', sa.Column('storage_codec', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('content_blobs', 'storage_codec')
+    op.drop_column('contents', 'storage_codec')
@@ -0,0 +1,111 @@
+"""added tiered text storage
+
+Revision ID: c1d4f7a9e362
+Revises: b8e2f5a7c931
+Create Date: 2026-10-17 20:44:18.519027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d4f7a9e362'
+down_revision: Union[str, Sequence[str], None] = 'b8e2f5a7c931'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def pg_search_vector(body: str) -> str:
+    return f"""
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(original_name, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, left(coalesce({body}, ''), 262144)), 'C')
+    """
+
+
+def sqlite_fts_triggers(body: str, watched: str) -> dict:
+    insert = f"""
+        INSERT INTO contents_fts (content_id, title, original_name, text_content, user_id)
+        VALUES (new.id, new.title, new.original_name, {body}, new.user_id);
+    """
+    remove = """
+        DELETE FROM contents_fts WHERE contents_fts MATCH 'content_id:"' || old.id || '"';
+    """
+    return {
+        'contents_fts_insert': f"AFTER INSERT ON contents BEGIN {insert} END",
+        'contents_fts_delete': f"AFTER DELETE ON contents BEGIN {remove} END",
+        'contents_fts_update': f"AFTER UPDATE OF {watched} ON contents BEGIN {remove} {insert} END",
+    }
+
+
+# Clips kept out of the row are indexed through their preview
+NEW_SEARCH = (
+    "coalesce(text_content, text_preview)",
+    "coalesce(new.text_content, new.text_preview)",
+    "title, original_name, text_content, text_preview, user_id",
+)
+OLD_SEARCH = ("text_content", "new.text_content", "title, original_name, text_content, user_id")
+
+# Text spilled to MinIO used to become a FILE row named {id}.txt with no MIME type
+LEGACY_SPILLED_TEXT = "content_type = 'FILE' AND mime_type IS NULL AND original_name = id || '.txt'"
+
+RESEED_STATS = """
+    INSERT INTO user_content_stats (user_id, text_count, file_count, total_bytes, last_modified)
+    SELECT user_id,
+           SUM(CASE WHEN content_type = 'TEXT' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN content_type = 'FILE' THEN 1 ELSE 0 END),
+           COALESCE(SUM(CASE WHEN content_type = 'FILE' THEN file_size ELSE 0 END), 0),
+           MAX(COALESCE(updated_at, created_at))
+    FROM contents
+    WHERE user_id IS NOT NULL AND status = 'READY'
+    GROUP BY user_id
+"""
+
+
+def rebuild_search(pg_body: str, fts_body: str, watched: str) -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_contents_search_vector', table_name='contents')
+        op.drop_column('contents', 'search_vector')
+        op.execute(f"ALTER TABLE contents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({pg_search_vector(pg_body)}) STORED")
+        op.create_index('ix_contents_search_vector', 'contents', ['search_vector'], postgresql_using='gin')
+    elif dialect == 'sqlite':
+        triggers = sqlite_fts_triggers(fts_body, watched)
+        for name, trigger in triggers.items():
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+            op.execute(f"CREATE TRIGGER {name} {trigger}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contents', sa.Column('text_storage', sa.String(), nullable=True))
+    op.add_column('contents', sa.Column('text_preview', sa.Text(), nullable=True))
+    op.create_table('content_texts',
+    sa.Column('content_id', sa.String(), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.ForeignKeyConstraint(['content_id'], ['contents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('content_id')
+    )
+    rebuild_search(*NEW_SEARCH)
+
+    op.execute(f"UPDATE contents SET content_type = 'TEXT', text_storage = 'object' WHERE {LEGACY_SPILLED_TEXT}")
+    op.execute("DELETE FROM user_content_stats")
+    op.execute(RESEED_STATS)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "UPDATE contents SET content_type = 'FILE' "
+        "WHERE content_type = 'TEXT' AND text_storage = 'object' AND original_name = id || '.txt'"
+    )
+    op.execute("DELETE FROM user_content_stats")
+    op.execute(RESEED_STATS)
+
+    rebuild_search(*OLD_SEARCH)
+    op.drop_table('content_texts')
+    op.drop_column('contents', 'text_preview')
+    op.drop_column('contents', 'text_storage')
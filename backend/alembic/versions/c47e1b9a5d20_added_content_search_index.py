@@ -0,0 +1,77 @@
+"""added content search index
+
+Revision ID: c47e1b9a5d20
+Revises: 8b2d4e6f1a93
+Create Date: 2026-10-17 12:26:51.384210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e1b9a5d20'
+down_revision: Union[str, Sequence[str], None] = '8b2d4e6f1a93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Postgres: generated tsvector, so every write keeps it current.
+# Text bodies are capped well below the 1MB tsvector limit.
+PG_SEARCH_VECTOR = """
+    setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(original_name, '')), 'B') ||
+    setweight(to_tsvector('english'::regconfig, left(coalesce(text_content, ''), 262144)), 'C')
+"""
+
+# SQLite: FTS5 shadow table maintained by triggers
+SQLITE_FTS_TABLE = """
+    CREATE VIRTUAL TABLE contents_fts USING fts5(
+        content_id, title, original_name, text_content, user_id UNINDEXED,
+        tokenize = 'porter unicode61 remove_diacritics 2'
+    )
+"""
+SQLITE_FTS_INSERT = """
+    INSERT INTO contents_fts (content_id, title, original_name, text_content, user_id)
+    VALUES (new.id, new.title, new.original_name, new.text_content, new.user_id);
+"""
+SQLITE_FTS_DELETE = """
+    DELETE FROM contents_fts WHERE contents_fts MATCH 'content_id:"' || old.id || '"';
+"""
+SQLITE_TRIGGERS = {
+    'contents_fts_insert': f"AFTER INSERT ON contents BEGIN {SQLITE_FTS_INSERT} END",
+    'contents_fts_delete': f"AFTER DELETE ON contents BEGIN {SQLITE_FTS_DELETE} END",
+    'contents_fts_update': (
+        "AFTER UPDATE OF title, original_name, text_content, user_id ON contents "
+        f"BEGIN {SQLITE_FTS_DELETE} {SQLITE_FTS_INSERT} END"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(f"ALTER TABLE contents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({PG_SEARCH_VECTOR}) STORED")
+        op.create_index('ix_contents_search_vector', 'contents', ['search_vector'], postgresql_using='gin')
+    elif dialect == 'sqlite':
+        op.execute(SQLITE_FTS_TABLE)
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {name} {body}")
+        op.execute(
+            "INSERT INTO contents_fts (content_id, title, original_name, text_content, user_id) "
+            "SELECT id, title, original_name, text_content, user_id FROM contents"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_contents_search_vector', table_name='contents')
+        op.drop_column('contents', 'search_vector')
+    elif dialect == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS contents_fts")
@@ -0,0 +1,76 @@
+"""added content name trigram index
+
+Revision ID: d5a83f2c9e71
+Revises: c47e1b9a5d20
+Create Date: 2026-10-17 13:48:05.902417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a83f2c9e71'
+down_revision: Union[str, Sequence[str], None] = 'c47e1b9a5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PG_TRGM_INDEXES = {
+    'ix_contents_title_trgm': 'title',
+    'ix_contents_original_name_trgm': 'original_name',
+}
+
+# SQLite: trigram-tokenized FTS5 side table, so LIKE-style substring lookups hit an index
+SQLITE_NAMES_TABLE = """
+    CREATE VIRTUAL TABLE contents_names USING fts5(
+        content_id, title, original_name, user_id UNINDEXED,
+        tokenize = 'trigram'
+    )
+"""
+SQLITE_NAMES_INSERT = """
+    INSERT INTO contents_names (content_id, title, original_name, user_id)
+    VALUES (new.id, new.title, new.original_name, new.user_id);
+"""
+SQLITE_NAMES_DELETE = """
+    DELETE FROM contents_names WHERE contents_names MATCH 'content_id:"' || old.id || '"';
+"""
+SQLITE_TRIGGERS = {
+    'contents_names_insert': f"AFTER INSERT ON contents BEGIN {SQLITE_NAMES_INSERT} END",
+    'contents_names_delete': f"AFTER DELETE ON contents BEGIN {SQLITE_NAMES_DELETE} END",
+    'contents_names_update': (
+        "AFTER UPDATE OF title, original_name, user_id ON contents "
+        f"BEGIN {SQLITE_NAMES_DELETE} {SQLITE_NAMES_INSERT} END"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, column in PG_TRGM_INDEXES.items():
+            op.create_index(name, 'contents', [column], postgresql_using='gin',
+                            postgresql_ops={column: 'gin_trgm_ops'})
+    elif dialect == 'sqlite':
+        op.execute(SQLITE_NAMES_TABLE)
+        for name, body in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {name} {body}")
+        op.execute(
+            "INSERT INTO contents_names (content_id, title, original_name, user_id) "
+            "SELECT id, title, original_name, user_id FROM contents"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        for name in PG_TRGM_INDEXES:
+            op.drop_index(name, table_name='contents')
+    elif dialect == 'sqlite':
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS contents_names")
@@ -0,0 +1,35 @@
+"""added text snippet
+
+Revision ID: d7a2c5e8b416
+Revises: c1d4f7a9e362
+Create Date: 2026-10-17 22:05:37.240913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a2c5e8b416'
+down_revision: Union[str, Sequence[str], None] = 'c1d4f7a9e362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Matches TEXT_SNIPPET_CHARS in services/text_store_service.py
+SNIPPET_CHARS = 200
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contents', sa.Column('text_snippet', sa.String(), nullable=True))
+    op.execute(
+        f"UPDATE contents SET text_snippet = substr(coalesce(text_content, text_preview), 1, {SNIPPET_CHARS}) "
+        "WHERE content_type = 'TEXT'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('contents', 'text_snippet')
@@ -0,0 +1,48 @@
+"""added user content stats
+
+Revision ID: e91f4c6b3a58
+Revises: d5a83f2c9e71
+Create Date: 2026-10-17 15:10:33.271846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91f4c6b3a58'
+down_revision: Union[str, Sequence[str], None] = 'd5a83f2c9e71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_content_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('text_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('file_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total_bytes', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('last_modified', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    # Seed the counters from existing content
+    op.execute("""
+        INSERT INTO user_content_stats (user_id, text_count, file_count, total_bytes, last_modified)
+        SELECT user_id,
+               SUM(CASE WHEN content_type = 'TEXT' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN content_type = 'FILE' THEN 1 ELSE 0 END),
+               COALESCE(SUM(CASE WHEN content_type = 'FILE' THEN file_size ELSE 0 END), 0),
+               MAX(COALESCE(updated_at, created_at))
+        FROM contents
+        WHERE user_id IS NOT NULL AND status = 'READY'
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_content_stats')
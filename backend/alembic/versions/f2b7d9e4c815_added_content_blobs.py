@@ -0,0 +1,50 @@
+"""added content blobs
+
+Revision ID: f2b7d9e4c815
+Revises: e91f4c6b3a58
+Create Date: 2026-10-17 16:37:12.660148
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d9e4c815'
+down_revision: Union[str, Sequence[str], None] = 'e91f4c6b3a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('content_blobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('size', sa.BigInteger(), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('object_name', sa.String(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'sha256', name='uq_content_blobs_user_sha256')
+    )
+    # Plain ADD COLUMN: a batch rebuild of contents would drop its search triggers on SQLite,
+    # which cannot add the foreign key afterwards either
+    op.add_column('contents', sa.Column('blob_id', sa.Integer(), nullable=True))
+    if op.get_bind().dialect.name != 'sqlite':
+        op.create_foreign_key('fk_contents_blob_id', 'contents', 'content_blobs', ['blob_id'], ['id'])
+    op.create_index('ix_contents_blob_id', 'contents', ['blob_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contents_blob_id', table_name='contents')
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fk_contents_blob_id', 'contents', type_='foreignkey')
+    op.drop_column('contents', 'blob_id')
+    op.drop_table('content_blobs')
@@ -0,0 +1,84 @@
+"""added full text body index
+
+Revision ID: f3a8c6e2d957
+Revises: a8e3f1b6d294
+Create Date: 2026-10-18 14:12:51.307629
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c6e2d957'
+down_revision: Union[str, Sequence[str], None] = 'a8e3f1b6d294'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Clips kept out of the row are indexed from their full body, which the app writes
+# (SearchService.index_body) to text_vector or the FTS row. Until it does, the preview
+# is indexed as before; existing clips are reindexed with python -m commands.reindex_text
+PG_SEARCH_VECTOR = """
+    setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(original_name, '')), 'B') ||
+    setweight(coalesce(text_vector, to_tsvector('english'::regconfig, left(coalesce(text_content, text_preview, ''), 262144))), 'C')
+"""
+OLD_PG_SEARCH_VECTOR = """
+    setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('english'::regconfig, coalesce(original_name, '')), 'B') ||
+    setweight(to_tsvector('english'::regconfig, left(coalesce(coalesce(text_content, text_preview), ''), 262144)), 'C')
+"""
+
+SQLITE_FTS_DELETE = """
+    DELETE FROM contents_fts WHERE contents_fts MATCH 'content_id:"' || old.id || '"';
+"""
+SQLITE_FTS_INSERT = """
+    INSERT INTO contents_fts (content_id, title, original_name, text_content, user_id)
+    VALUES (new.id, new.title, new.original_name, coalesce(new.text_content, new.text_preview), new.user_id);
+"""
+# Updated in place rather than deleted and re-inserted, so an indexed full body survives
+SQLITE_FTS_UPDATE = """
+    UPDATE contents_fts SET
+        title = new.title,
+        original_name = new.original_name,
+        text_content = CASE WHEN new.text_content IS NOT NULL THEN new.text_content
+                            WHEN new.text_preview IS NOT old.text_preview THEN new.text_preview
+                            ELSE text_content END,
+        user_id = new.user_id
+    WHERE contents_fts MATCH 'content_id:"' || old.id || '"';
+"""
+SQLITE_WATCHED = "title, original_name, text_content, text_preview, user_id"
+
+
+def rebuild_pg_search_vector(expression: str) -> None:
+    op.drop_index('ix_contents_search_vector', table_name='contents')
+    op.drop_column('contents', 'search_vector')
+    op.execute(f"ALTER TABLE contents ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({expression}) STORED")
+    op.create_index('ix_contents_search_vector', 'contents', ['search_vector'], postgresql_using='gin')
+
+
+def replace_sqlite_update_trigger(body: str) -> None:
+    op.execute("DROP TRIGGER IF EXISTS contents_fts_update")
+    op.execute(f"CREATE TRIGGER contents_fts_update AFTER UPDATE OF {SQLITE_WATCHED} ON contents BEGIN {body} END")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("ALTER TABLE contents ADD COLUMN text_vector tsvector")
+        rebuild_pg_search_vector(PG_SEARCH_VECTOR)
+    elif dialect == 'sqlite':
+        replace_sqlite_update_trigger(SQLITE_FTS_UPDATE)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        rebuild_pg_search_vector(OLD_PG_SEARCH_VECTOR)
+        op.drop_column('contents', 'text_vector')
+    elif dialect == 'sqlite':
+        replace_sqlite_update_trigger(f"{SQLITE_FTS_DELETE} {SQLITE_FTS_INSERT}")
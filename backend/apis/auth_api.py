@@ -2,15 +2,17 @@ import os
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
-from db.db_conn import get_db
+from db.db_conn import get_async_db
 from db.schemas import user_schema
 from services.user_service import UserService
 from utils import resp_msgs, app_logger
 from utils.app_helper import generate_otp, verify_otp, create_refresh_token, create_auth_token, verify_user_from_token
 from utils.app_logger import createLogger
+from utils.minio_conn import get_minio_service
+from utils.executor import run_storage
 
 from utils.dependencies import get_current_user
 
@@ -48,7 +50,7 @@ async def request_otp(request: user_schema.UserRegistration):
 
 @router.post("/verify-otp", status_code=status.HTTP_200_OK, name="verify-otp")
 async def verify_mobile_and_otp(request: user_schema.OTPVerification,
-                                db: Session = Depends(get_db)):
+                                db: AsyncSession = Depends(get_async_db)):
     if not request.phone_number or not request.otp:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -64,13 +66,24 @@ async def verify_mobile_and_otp(request: user_schema.OTPVerification,
         )
 
     try:
-        user = UserService.create_user_by_phone_number(phone_number=request.phone_number, db=db)
+        user = await UserService.create_user_by_phone_number(phone_number=request.phone_number, db=db)
         if not user:
             logger.info(f"Not able to create user get_or_create_user_by_phone_number")
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"status": "error", "message": resp_msgs.INVALID_OTP}
             )
+        if not user.is_active:
+            return JSONResponse(
+                status_code=status.HTTP_403_FORBIDDEN,
+                content={"status": "error", "message": resp_msgs.USER_INACTIVE}
+            )
+
+        # Provision the user's bucket now so the first upload doesn't pay for it
+        try:
+            await run_storage(get_minio_service().create_user_bucket, str(user.phone_number))
+        except Exception as e:
+            logger.warning(f"Could not provision bucket for user {user.id}: {e}")
 
         auth_token = create_auth_token(user)
         refresh_token = create_refresh_token(user)
@@ -94,7 +107,7 @@ async def verify_mobile_and_otp(request: user_schema.OTPVerification,
 @router.get("/auth-validity", name="auth-validity")
 async def health_check(
         current_user = Depends(get_current_user),
-        db: Session = Depends(get_db)):
+        db: AsyncSession = Depends(get_async_db)):
 
     return {
         "status": "healthy",
@@ -1,32 +1,68 @@
+import asyncio
+import os
 import urllib.parse
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Request, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
+from sqlalchemy import delete, select, func, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from typing import Optional, List, Literal
 import json
+import orjson
 import uuid
 import logging
-import io
+from datetime import datetime, timezone
 
 from starlette.responses import JSONResponse
 
-from db.db_conn import get_db
-from db.models import Content, ContentType, User
+from db.db_conn import AsyncSessionLocal, get_async_db
+from db.models import Content, ContentTombstone, ContentType, ContentStatus, User
 from db.schema import (
+    BatchUploadResponse,
+    BulkDeleteItemResult,
+    BulkDeleteRequest,
+    BulkDeleteResponse,
+    ContentArchiveRequest,
+    ContentChangesResponse,
     ContentResponse, 
     ContentListResponse,
+    ContentPrecheckRequest,
+    ContentPrecheckResponse,
+    ContentSearchResponse,
+    ContentNameMatch,
+    ContentNameSearchResponse,
     ContentUpdateRequest,
     ContentTypeEnum
 )
-from utils import app_logger
-from utils.app_helper import sanitize_title
+from utils import app_logger, naive_utc, utcnow
+from utils.app_helper import sanitize_title, text_hash
+from utils.content_serializer import CONTENT_FIELDS, SUMMARY_FIELDS, content_response, serialize_content, serialize_contents
+from services.search_service import SearchService
+from services.stats_service import ContentStatsService
+from services.blob_service import BlobService
+from services.change_service import ChangeService
+from services.text_store_service import OBJECT, TextStoreService
 
 from utils.dependencies import get_current_user
 # from utils.minio_conn import minio_client
 from minio.error import S3Error
 
-from utils.minio_conn import MinIOService
+from utils.minio_conn import get_minio_service, iter_object_response, stream_object
+from utils.executor import run_storage
+from utils.upload_stream import UploadStream, UploadTooLarge, UPLOAD_PART_SIZE
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from utils.storage_codec import CompressingStream, accepts_encoding, choose_codec, decode_chunks, slice_chunks
+from utils.zip_stream import ZipStream
+from utils.http_range import (
+    RangeNotSatisfiable,
+    http_date,
+    is_not_modified,
+    multipart_byteranges,
+    parse_range_header,
+    quote_etag,
+    range_applies
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -37,6 +73,24 @@ router = APIRouter(prefix="/content", tags=["Content Management"])
 # File size limit: 20MB
 MAX_FILE_SIZE = 20 * 1024 * 1024  # 20MB in bytes
 
+MAX_PAGE_SIZE = 200
+
+# The change feed pages further since clients drain it in a loop
+MAX_CHANGES_PAGE_SIZE = 1000
+
+# Text clips are capped at 1M characters, as in TextContentCreate
+MAX_TEXT_LENGTH = 1000000
+
+# Rows deleted per statement and transaction by bulk delete
+BULK_DELETE_CHUNK_SIZE = 500
+
+# Rows fetched per round trip by the streaming list
+LIST_STREAM_BATCH_SIZE = 500
+
+BATCH_UPLOAD_MAX_ITEMS = int(os.getenv("BATCH_UPLOAD_MAX_ITEMS", 50))
+# Objects written to MinIO at once per batch request
+BATCH_UPLOAD_CONCURRENCY = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", 4))
+
 # Allowed file types
 ALLOWED_FILE_TYPES = {
     # Images
@@ -102,6 +156,98 @@ def serialize_tags(tags: Optional[List[str]]) -> Optional[str]:
     return json.dumps(tags)
 
 
+def validate_upload_file(file: UploadFile):
+    """Reject a disallowed type, or a size already known to be too big"""
+    if file.content_type not in ALLOWED_FILE_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"File type {file.content_type} not allowed"
+        )
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size allowed is {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+
+
+def stored_object_name(content_id: str, filename: str) -> str:
+    file_extension = filename.split('.')[-1] if '.' in filename else ''
+    return f"{content_id}.{file_extension}" if file_extension else content_id
+
+
+def upload_writer(minio_service, file: UploadFile, stored_filename: str, codec: Optional[str]):
+    """with_user_bucket operation streaming an upload into MinIO; returns (bucket, bytes read, sha256)"""
+    def put_file(bucket_name):
+        # Stream the spool to MinIO part by part instead of reading it whole
+        file.file.seek(0)
+        file_stream = UploadStream(file.file, max_size=MAX_FILE_SIZE)
+        minio_service.client.put_object(
+            bucket_name,
+            stored_filename,
+            CompressingStream(file_stream, codec) if codec else file_stream,
+            length=file.size if file.size is not None and not codec else -1,
+            part_size=UPLOAD_PART_SIZE,
+            content_type=file.content_type,
+            metadata={"Content-Encoding": codec} if codec else None
+        )
+        return bucket_name, file_stream.bytes_read, file_stream.sha256
+    return put_file
+
+
+def file_content(content_id: str, filename: str, mime_type: Optional[str], title: Optional[str],
+                 user, blob, file_size: int) -> Content:
+    """Content row for a file stored as blob"""
+    return Content(
+        id=content_id,
+        content_type=ContentType.FILE,
+        title=title or filename,
+        user_id=user.id,
+        filename=blob.object_name,
+        original_name=filename,
+        bucket=blob.bucket,
+        file_path=f"{user.phone_number}/{blob.object_name}",
+        file_size=file_size,
+        mime_type=mime_type,
+        blob_id=blob.id,
+        storage_codec=blob.storage_codec
+    )
+
+
+def text_title(text_content: str) -> str:
+    title = text_content
+    if len(text_content) > 60:
+        title = sanitize_title(text_content[:60])
+    return title or "Text Content"
+
+
+# Columns each list field reads; anything not asked for stays deferred
+LIST_FIELD_COLUMNS = {
+    "id": [Content.id],
+    "content_type": [Content.content_type],
+    "title": [Content.title],
+    "tags": [Content.tags],
+    "created_at": [Content.created_at],
+    "updated_at": [Content.updated_at],
+    "text_content": [Content.content_type, Content.text_content, Content.text_storage, Content.storage_codec],
+    "preview": [Content.text_snippet],
+    "filename": [Content.filename],
+    "original_name": [Content.original_name],
+    "bucket": [Content.bucket],
+    "file_size": [Content.file_size],
+    "mime_type": [Content.mime_type],
+    "download_url": [Content.content_type],
+}
+
+
+def parse_fields(fields: str) -> List[str]:
+    """Validate a comma-separated fields= projection; id is always included"""
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in LIST_FIELD_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return ["id"] + [name for name in dict.fromkeys(names) if name != "id"]
+
+
 @router.post("/upload", response_model=ContentResponse)
 async def upload_content(
     # Optional file upload
@@ -112,8 +258,10 @@ async def upload_content(
     title: Optional[str] = Form(None),
     tags: Optional[str] = Form(None),
     bucket: str = Form("shared"),
+    # Reuse an identical existing text clip instead of storing another copy
+    dedupe: bool = Form(False),
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Unified endpoint for uploading both files and text content.
@@ -121,6 +269,8 @@ async def upload_content(
     - For file upload: provide 'file' parameter
     - For text content: provide 'text_content' parameter
     - Both can have optional title and tags
+    - With dedupe=true, re-sending a text clip that is already stored only bumps
+      its updated_at and returns the existing record
     """
     
     # Validate that either file or text_content is provided, but not both
@@ -138,130 +288,81 @@ async def upload_content(
     
     content_id = str(uuid.uuid4())
     bucket = str(current_user.phone_number)
+    existing = None
     
     try:
         if file:
-            file_content = await file.read()
-            file_size = len(file_content)
-            
-            if file_size > MAX_FILE_SIZE:
-                raise HTTPException(
-                    status_code=413, 
-                    detail=f"File too large. Maximum size allowed is {MAX_FILE_SIZE // (1024*1024)}MB"
-                )
+            validate_upload_file(file)
+            stored_filename = stored_object_name(content_id, file.filename)
             
-            # Validate file type
-            if file.content_type not in ALLOWED_FILE_TYPES:
-                raise HTTPException(
-                    status_code=415,
-                    detail=f"File type {file.content_type} not allowed"
-                )
-            
-            # Generate unique filename
-            file_extension = file.filename.split('.')[-1] if '.' in file.filename else ''
-            stored_filename = f"{content_id}.{file_extension}" if file_extension else content_id
-            
-            # Upload to MinIO
-            from io import BytesIO
-            file_stream = BytesIO(file_content)
-
             # Initialize MinIO service
-            minio_service = MinIOService()
+            minio_service = get_minio_service()
 
-            bucket_name = minio_service.create_user_bucket(bucket)
-            
-            minio_service.client.put_object(
-                bucket_name,
-                stored_filename,
-                file_stream,
-                length=file_size,
-                part_size=10 * 1024 * 1024,
-                content_type=file.content_type
-            )
+            # Text-like files are compressed on the way in
+            codec = choose_codec(file.content_type, file.size)
+            put_file = upload_writer(minio_service, file, stored_filename, codec)
+            bucket_name, file_size, sha256 = await run_storage(minio_service.with_user_bucket, bucket, put_file)
+
+            # Share the stored object with any earlier upload of the same bytes
+            blob = await BlobService.attach(db, current_user.id, sha256, file_size, bucket_name, stored_filename, codec)
+            if blob.object_name != stored_filename:
+                try:
+                    await run_storage(minio_service.client.remove_object, bucket_name, stored_filename)
+                except S3Error as e:
+                    logger.warning(f"Failed to remove duplicate upload {bucket_name}/{stored_filename}: {e}")
+                logger.info(f"Duplicate upload {file.filename} deduplicated against {blob.object_name}")
             
             # Create file content record
-            content = Content(
-                id=content_id,
-                content_type=ContentType.FILE,
-                title=title or file.filename,
-                user_id=current_user.id,
-                filename=stored_filename,
-                original_name=file.filename,
-                bucket=bucket_name,
-                file_path=f"{bucket}/{stored_filename}",
-                file_size=file_size,
-                mime_type=file.content_type
-            )
+            content = file_content(content_id, file.filename, file.content_type, title, current_user, blob, file_size)
             
             logger.info(f"File uploaded: {file.filename} ({file_size} bytes) by user {current_user.phone_number}")
             
         # Handle text content
         else:
-            # Validate text content length
-            if len(text_content) > 100000:
-                # Upload to MinIO as .txt file
-                minio_service = MinIOService()
+            content_hash = text_hash(text_content)
+            if dedupe:
+                existing = await db.scalar(select(Content).where(
+                    Content.user_id == current_user.id,
+                    Content.text_hash == content_hash,
+                    Content.status == ContentStatus.READY
+                ).order_by(Content.created_at.desc()).limit(1))
 
-                bucket_name = minio_service.create_user_bucket(bucket)
+            if existing:
+                existing.updated_at = utcnow()
+                content = existing
+                text_content = await TextStoreService.load(db, existing)
+                logger.info(f"Duplicate text content {existing.id} bumped by user {current_user.phone_number}")
 
-                text_file = io.BytesIO(text_content.encode('utf-8'))
-                stored_file_name = f"{content_id}.txt"
-                minio_service.client.put_object(bucket_name,
-                                                stored_file_name,
-                                                text_file, len(text_content))
-
-                content = Content(
-                    id=content_id,
-                    content_type=ContentType.FILE,
-                    filename=stored_file_name,
-                    original_name=stored_file_name,
-                    title=stored_file_name,
-                    text_content=None ,
-                    user_id=current_user.id,
-                    bucket=bucket_name,
-                    file_path=f"{bucket}/{stored_file_name}",
-                    file_size=len(text_content)
-                )
             else:
-
-                title = text_content
-                if len(text_content) > 60:
-                    title = sanitize_title(text_content[:60])
-
-                # Create text content record
+                # Create text content record; the body goes inline, compressed or to MinIO by size
                 content = Content(
                     id=content_id,
                     content_type=ContentType.TEXT,
-                    title=title or "Text Content",
+                    title=text_title(text_content),
                     user_id=current_user.id,
-                    text_content=text_content
+                    text_hash=content_hash
                 )
-            
+                await TextStoreService.store(db, content, text_content, bucket)
+
                 logger.info(f"Text content created by user {current_user.phone_number}")
         
-        # Save to database
-        db.add(content)
-        db.commit()
-        db.refresh(content)
+        # Save to database, counting it in the user's stats in the same transaction
+        if not existing:
+            db.add(content)
+            await ContentStatsService.record_added(db, content)
+        await ChangeService.record_changed(db, current_user.id, [content])
+        await db.commit()
+        await db.refresh(content)
         
-        # Prepare response
-        response_data = ContentResponse(
-            id=content.id,
-            content_type=ContentTypeEnum.FILE if content.content_type == ContentType.FILE else ContentTypeEnum.TEXT,
-            title=content.title,
-            created_at=content.created_at,
-            updated_at=content.updated_at,
-            text_content=content.text_content,
-            filename=content.filename,
-            original_name=content.original_name,
-            bucket=content.bucket,
-            file_size=content.file_size,
-            mime_type=content.mime_type,
-            download_url=f"/api/v1/content/download/{content.id}" if content.content_type == ContentType.FILE else None
-        )
-        
-        return response_data
+        return content_response(content, text_content if content.content_type == ContentType.TEXT else None)
         
+    except HTTPException:
+        raise
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size allowed is {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
     except S3Error as e:
         app_logger.exceptionlogs(f"MinIO error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
@@ -270,114 +371,552 @@ async def upload_content(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_batch(
+    file: List[UploadFile] = File([]),
+    text_content: List[str] = Form([]),
+    bucket: str = Form("shared"),
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upload several files and text items in one multipart request.
+
+    Repeat the 'file' and 'text_content' fields once per item. Objects are written
+    to MinIO concurrently and every content row is saved in one transaction.
+    results reports each item, files first and then text items, in request order.
+    If saving fails, the objects written for this request are removed again.
+    """
+    items = [(ContentType.FILE, upload) for upload in file] + [(ContentType.TEXT, text) for text in text_content]
+    if not items:
+        raise HTTPException(status_code=400, detail="Provide at least one file or text_content")
+    if len(items) > BATCH_UPLOAD_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_UPLOAD_MAX_ITEMS} items per batch")
+
+    bucket = str(current_user.phone_number)
+    minio_service = get_minio_service()
+    semaphore = asyncio.Semaphore(BATCH_UPLOAD_CONCURRENCY)
+    errors = {}
+    written = []  # Objects created by this request, removed again if saving fails
+
+    async def store_file(index, upload):
+        try:
+            validate_upload_file(upload)
+        except HTTPException as e:
+            errors[index] = e.detail
+            return None
+
+        content_id = str(uuid.uuid4())
+        stored_filename = stored_object_name(content_id, upload.filename)
+        codec = choose_codec(upload.content_type, upload.size)
+        async with semaphore:
+            try:
+                bucket_name, file_size, sha256 = await run_storage(
+                    minio_service.with_user_bucket, bucket, upload_writer(minio_service, upload, stored_filename, codec)
+                )
+            except UploadTooLarge:
+                errors[index] = f"File too large. Maximum size allowed is {MAX_FILE_SIZE // (1024*1024)}MB"
+                return None
+            except Exception as e:
+                # Connection errors and the like fail this item only; its siblings carry on
+                app_logger.exceptionlogs(f"Error storing {upload.filename} in batch upload: {e}")
+                errors[index] = "Failed to store file"
+                return None
+        written.append((bucket_name, stored_filename))
+        return index, content_id, upload, stored_filename, bucket_name, file_size, sha256, codec
+
+    async def remove_written():
+        try:
+            await run_storage(minio_service.remove_objects, written)
+        except Exception as cleanup_error:
+            app_logger.exceptionlogs(f"Failed to remove objects of a failed batch upload {written}: {cleanup_error}")
+
+    created = {}
+    duplicates = []
+    try:
+        stored_files = await asyncio.gather(*(
+            store_file(index, upload) for index, (kind, upload) in enumerate(items) if kind == ContentType.FILE
+        ))
+
+        for stored in stored_files:
+            if stored is None:
+                continue
+            index, content_id, upload, stored_filename, bucket_name, file_size, sha256, codec = stored
+            blob = await BlobService.attach(db, current_user.id, sha256, file_size, bucket_name, stored_filename, codec)
+            if blob.object_name != stored_filename:
+                duplicates.append((bucket_name, stored_filename))
+            content = file_content(content_id, upload.filename, upload.content_type, None, current_user, blob, file_size)
+            db.add(content)
+            created[index] = (content, None)
+
+        for index, (kind, text) in enumerate(items):
+            if kind != ContentType.TEXT:
+                continue
+            if not text or len(text) > MAX_TEXT_LENGTH:
+                errors[index] = f"Text must be 1 to {MAX_TEXT_LENGTH} characters"
+                continue
+            content = Content(
+                id=str(uuid.uuid4()),
+                content_type=ContentType.TEXT,
+                title=text_title(text),
+                user_id=current_user.id,
+                text_hash=text_hash(text)
+            )
+            await TextStoreService.store(db, content, text, bucket)
+            if content.text_storage == OBJECT:
+                written.append((content.bucket, content.filename))
+            created[index] = (content, text)
+
+        await ContentStatsService.record_added_many(db, current_user.id, [content for content, _ in created.values()])
+        await ChangeService.record_changed(db, current_user.id, [content for content, _ in created.values()])
+        await db.commit()
+    except asyncio.CancelledError:
+        # Client went away mid-batch: nothing was committed, so nothing written may stay
+        await db.rollback()
+        await remove_written()
+        raise
+    except Exception as e:
+        await db.rollback()
+        app_logger.exceptionlogs(f"Error saving batch upload: {e}")
+        await remove_written()
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+    # Reload what the database stored (e.g. timestamps) with one query instead of a refresh per row
+    if created:
+        await db.execute(
+            select(Content).where(Content.id.in_([content.id for content, _ in created.values()]))
+            .execution_options(populate_existing=True)
+        )
+
+    # Copies of bytes that were already stored
+    if duplicates:
+        try:
+            await run_storage(minio_service.remove_objects, duplicates)
+        except S3Error as e:
+            logger.warning(f"Failed to remove duplicate batch uploads: {e}")
+
+    results = []
+    for index, (kind, item) in enumerate(items):
+        result = {
+            "index": index,
+            "content_type": ContentTypeEnum.FILE.value if kind == ContentType.FILE else ContentTypeEnum.TEXT.value,
+            "name": item.filename if kind == ContentType.FILE else None,
+            "success": index in created,
+            "content": None,
+            "error": errors.get(index),
+        }
+        if index in created:
+            content, text = created[index]
+            result["content"] = serialize_content(content, text)
+        results.append(result)
+
+    logger.info(f"Batch upload of {len(created)}/{len(items)} items by user {current_user.phone_number}")
+
+    return ORJSONResponse({"results": results, "files_uploaded": len(created), "failed": len(items) - len(created)})
+
+
+@router.post("/precheck", response_model=ContentPrecheckResponse)
+async def precheck_upload(
+    request: ContentPrecheckRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Ask whether a file is already stored, by SHA-256 and size.
+
+    If it is, a new content record pointing at the stored copy is created and
+    returned, and the client can skip uploading the bytes.
+    """
+    mime_type = request.mime_type or "application/octet-stream"
+    if mime_type not in ALLOWED_FILE_TYPES:
+        raise HTTPException(status_code=415, detail=f"File type {mime_type} not allowed")
+
+    blob = await BlobService.find(db, current_user.id, request.sha256.lower())
+    if not blob or blob.size != request.size:
+        return ContentPrecheckResponse(exists=False)
+
+    if not await BlobService.add_reference(db, blob.id):
+        return ContentPrecheckResponse(exists=False)
+
+    content = file_content(str(uuid.uuid4()), request.filename, mime_type, request.title, current_user, blob, blob.size)
+    content.tags = serialize_tags(request.tags)
+    db.add(content)
+    await ContentStatsService.record_added(db, content)
+    await ChangeService.record_changed(db, current_user.id, [content])
+    await db.commit()
+    await db.refresh(content)
+
+    logger.info(f"Precheck hit: {request.filename} stored as {blob.object_name} for user {current_user.phone_number}")
+
+    return ORJSONResponse({"exists": True, "content": serialize_content(content)})
+
+
+def content_list_query(db: AsyncSession, user_id: int, selected, content_type: Optional[ContentTypeEnum],
+                       search: Optional[str], search_mode: str):
+    """The user's ready content matching the list filters, loading only what selected fields need"""
+    # Keyset pagination always needs id and created_at
+    columns = {Content.id, Content.created_at}
+    for name in selected:
+        columns.update(LIST_FIELD_COLUMNS[name])
+
+    query = select(Content).options(load_only(*columns)).where(
+        Content.user_id == user_id,
+        Content.status == ContentStatus.READY
+    )
+
+    # Filter by content type
+    if content_type:
+        if content_type == ContentTypeEnum.FILE:
+            query = query.where(Content.content_type == ContentType.FILE)
+        elif content_type == ContentTypeEnum.TEXT:
+            query = query.where(Content.content_type == ContentType.TEXT)
+
+    # Search title, file name and text content through the full-text index,
+    # or title and file name by substring through the trigram index
+    if search:
+        if search_mode == "name":
+            query = query.where(SearchService.name_filter(db, search, user_id))
+        else:
+            query = query.where(SearchService.match_filter(db, search, user_id))
+    return query
+
+
 @router.get("/list", response_model=ContentListResponse)
 async def list_content(
     content_type: Optional[ContentTypeEnum] = None,
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    offset: int = Query(0, ge=0, deprecated=True),
     search: Optional[str] = None,
+    search_mode: Literal["text", "name"] = "text",
+    include_total: bool = False,
+    view: Literal["summary", "full"] = "summary",
+    fields: Optional[str] = None,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    """
+    List content newest first with optional filtering.
+
+    Pass the returned next_cursor as cursor to fetch the following page.
+    total_count is only computed when include_total=true.
+    search_mode=name matches search as a substring of title or file name.
+    The default summary view returns a short text preview instead of text_content;
+    view=full includes text_content (except for clips stored in MinIO, see GET /{id}).
+    fields=id,title,... returns only those fields of each item.
+    """
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    selected = parse_fields(fields) if fields else (CONTENT_FIELDS if view == "full" else SUMMARY_FIELDS)
+
     try:
-        """List all content with optional filtering"""
-
-        query = db.query(Content).filter(Content.user_id == current_user.id)
-
-        # Filter by content type
-        if content_type:
-            if content_type == ContentTypeEnum.FILE:
-                query = query.filter(Content.content_type == ContentType.FILE)
-            elif content_type == ContentTypeEnum.TEXT:
-                query = query.filter(Content.content_type == ContentType.TEXT)
-
-        # Search in title and text content
-        if search:
-            search_filter = f"%{search}%"
-            query = query.filter(
-                (Content.title.ilike(search_filter)) |
-                (Content.text_content.ilike(search_filter)) |
-                (Content.original_name.ilike(search_filter))
-            )
+        query = content_list_query(db, current_user.id, selected, content_type, search, search_mode)
 
-        # Get total count
-        total_count = query.count()
+        # Counting walks every matching row, so only do it on request
+        total_count = None
+        if include_total:
+            total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
 
-        # Apply pagination
-        contents = query.order_by(Content.created_at.desc()).offset(offset).limit(limit).all()
+        # Seek past the last row of the previous page; matches ix_contents_user_created_id
+        if position:
+            created_at, last_id = position
+            query = query.where(or_(
+                Content.created_at < created_at,
+                and_(Content.created_at == created_at, Content.id > last_id)
+            ))
+        elif offset:
+            query = query.offset(offset)
 
-        # Prepare response
-        content_responses = []
-        for content in contents:
-            response_data = ContentResponse(
-                id=content.id,
-                content_type=ContentTypeEnum.FILE if content.content_type == ContentType.FILE else ContentTypeEnum.TEXT,
-                title=content.title,
-                tags=json.loads(content.tags) if content.tags else None,
-                created_at=content.created_at,
-                updated_at=content.updated_at,
-                text_content=content.text_content,
-                filename=content.filename,
-                original_name=content.original_name,
-                bucket=content.bucket,
-                file_size=content.file_size,
-                mime_type=content.mime_type,
-                download_url=f"/api/v1/content/download/{content.id}" if content.content_type == ContentType.FILE else None
-            )
-            content_responses.append(response_data)
+        # Fetch one extra row to tell whether another page exists
+        rows = (await db.scalars(query.order_by(Content.created_at.desc(), Content.id).limit(limit + 1))).all()
+        contents = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(contents[-1].created_at, contents[-1].id)
 
-        return ContentListResponse(
-            contents=content_responses,
-            total_count=total_count
-        )
+        # Clips stored in MinIO are only fetched by get_content
+        texts = {}
+        if "text_content" in selected:
+            texts = await TextStoreService.load_many(db, contents)
+
+        # Built once from the rows; a projection leaves out fields the response model requires
+        return ORJSONResponse({
+            "contents": serialize_contents(contents, selected, texts),
+            "total_count": total_count,
+            "next_cursor": next_cursor
+        })
     except Exception as e:
         app_logger.exceptionlogs(f"Error {e}")
         return JSONResponse(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@router.get("/list/stream")
+async def stream_content_list(
+    content_type: Optional[ContentTypeEnum] = None,
+    search: Optional[str] = None,
+    search_mode: Literal["text", "name"] = "text",
+    view: Literal["summary", "full"] = "summary",
+    fields: Optional[str] = None,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Every matching item in one response, as NDJSON: one ContentResponse
+    object per line, newest first, with the filters and views of /list.
+
+    Rows are read through a server-side cursor LIST_STREAM_BATCH_SIZE at a
+    time and each batch is sent as soon as it is serialized, so memory stays
+    flat however large the vault is. A failure part way through aborts the
+    connection instead of ending the body normally.
+    """
+    selected = parse_fields(fields) if fields else (CONTENT_FIELDS if view == "full" else SUMMARY_FIELDS)
+    query = content_list_query(db, current_user.id, selected, content_type, search, search_mode)
+    query = query.order_by(Content.created_at.desc(), Content.id).execution_options(yield_per=LIST_STREAM_BATCH_SIZE)
+    with_texts = "text_content" in selected
+
+    async def ndjson_generator():
+        # The request's session is closed once the response starts, so the cursor gets its own
+        async with AsyncSessionLocal() as session:
+            sent = 0
+            try:
+                result = await session.stream_scalars(query)
+                async for contents in result.partitions():
+                    texts = await TextStoreService.load_many(session, contents) if with_texts else None
+                    yield b"".join(
+                        orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE)
+                        for item in serialize_contents(contents, selected, texts)
+                    )
+                    sent += len(contents)
+            except Exception as e:
+                # Headers are gone already: abort the connection so the client cannot
+                # mistake a truncated listing for a complete one
+                app_logger.exceptionlogs(f"Error streaming content list after {sent} items: {e}")
+                raise
+
+    return StreamingResponse(ndjson_generator(), media_type="application/x-ndjson")
+
+
+@router.get("/changes", response_model=ContentChangesResponse)
+async def list_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=MAX_CHANGES_PAGE_SIZE),
+    view: Literal["summary", "full"] = "summary",
+    fields: Optional[str] = None,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Content added, modified or deleted after change number since, oldest change first.
+
+    Start with since=0 (every item, no deletes) and pass the returned cursor
+    as since next time. changes holds the current state of each changed item
+    in the view / fields of /list, deleted the ids removed in the meantime.
+    While has_more is true, call again with the new cursor straight away.
+    410 means since is ahead of the server (e.g. a restored database): resync from 0.
+    """
+    selected = parse_fields(fields) if fields else (CONTENT_FIELDS if view == "full" else SUMMARY_FIELDS)
+
+    current = await db.scalar(select(User.content_seq).where(User.id == current_user.id))
+    if since > (current or 0):
+        raise HTTPException(status_code=410, detail="Cursor is ahead of the server; resync from since=0")
+
+    columns = {Content.id, Content.change_seq}
+    for name in selected:
+        columns.update(LIST_FIELD_COLUMNS[name])
+
+    # Both sides are read in change order, one row past the page to tell whether more follow
+    contents = (await db.scalars(select(Content).options(load_only(*columns)).where(
+        Content.user_id == current_user.id,
+        Content.status == ContentStatus.READY,
+        Content.change_seq > since
+    ).order_by(Content.change_seq).limit(limit + 1))).all()
+
+    tombstones = []
+    if since:
+        tombstones = (await db.execute(select(ContentTombstone.change_seq, ContentTombstone.content_id).where(
+            ContentTombstone.user_id == current_user.id,
+            ContentTombstone.change_seq > since
+        ).order_by(ContentTombstone.change_seq).limit(limit + 1))).all()
+
+    events = sorted(
+        [(content.change_seq, content, None) for content in contents] +
+        [(seq, None, content_id) for seq, content_id in tombstones],
+        key=lambda event: event[0]
+    )
+    page = events[:limit]
+    changed = [content for _, content, _ in page if content is not None]
+
+    texts = await TextStoreService.load_many(db, changed) if "text_content" in selected else None
+
+    return ORJSONResponse({
+        "changes": serialize_contents(changed, selected, texts),
+        "deleted": [content_id for _, content, content_id in page if content is None],
+        "cursor": page[-1][0] if page else since,
+        "has_more": len(events) > limit
+    })
+
+
+@router.get("/search", response_model=ContentSearchResponse)
+async def search_content(
+    q: str = Query(..., min_length=1, max_length=256),
+    content_type: Optional[ContentTypeEnum] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Full-text search ranked by relevance, with highlighted snippets"""
+    model_type = None
+    if content_type:
+        model_type = ContentType.FILE if content_type == ContentTypeEnum.FILE else ContentType.TEXT
+
+    matches = await SearchService.search(db, q, current_user.id, content_type=model_type, limit=limit)
+
+    return ORJSONResponse({"results": [
+        {**serialize_content(content), "rank": rank, "snippet": snippet}
+        for content, rank, snippet in matches
+    ]})
+
+
+@router.get("/search/names", response_model=ContentNameSearchResponse)
+async def search_content_names(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(10, ge=1, le=50),
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Type-ahead lookup by partial title or file name (e.g. "IMG_20", ".pdf")"""
+    rows = await SearchService.search_names(db, q, current_user.id, limit=limit)
+    return ContentNameSearchResponse(results=[
+        ContentNameMatch(
+            id=row.id,
+            content_type=ContentTypeEnum.FILE if row.content_type == ContentType.FILE else ContentTypeEnum.TEXT,
+            title=row.title,
+            original_name=row.original_name,
+            mime_type=row.mime_type,
+            created_at=row.created_at
+        )
+        for row in rows
+    ])
+
+
 @router.get("/download/{content_id}")
 async def download_file(
     content_id: str,
+    request: Request,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Download file content"""
+    """
+    Download file content.
+
+    Supports single and multiple byte ranges (Range / If-Range) and
+    conditional requests (If-None-Match / If-Modified-Since).
+    Compressed objects are sent as stored with Content-Encoding when the
+    client accepts the codec, otherwise decompressed on the fly. Ranges of a
+    compressed object address its decompressed bytes.
+    """
     
-    content = db.query(Content).filter(
+    content = await db.scalar(select(Content).where(
         Content.id == content_id,
         Content.user_id == current_user.id,
-        Content.content_type == ContentType.FILE
-    ).first()
+        Content.content_type == ContentType.FILE,
+        Content.status == ContentStatus.READY
+    ))
     
     if not content:
         raise HTTPException(status_code=404, detail="File content not found")
     
     try:
-        minio_service = MinIOService()
-        # Get file from MinIO
-        response = minio_service.client.get_object(content.bucket, content.filename)
-        
-        def file_generator():
+        minio_service = get_minio_service()
+        stat = await run_storage(minio_service.client.stat_object, content.bucket, content.filename)
+
+        media_type = content.mime_type or "application/octet-stream"
+        encoded_filename = urllib.parse.quote(content.original_name)
+
+        # Encoded and decoded bodies of a compressed object are different representations.
+        # Range requests get the decoded one, so a resumed download lines up with file_size
+        codec = content.storage_codec
+        passthrough = (bool(codec) and "range" not in request.headers
+                       and accepts_encoding(request.headers.get("accept-encoding"), codec))
+        etag = stat.etag
+        size = stat.size
+        if codec:
+            etag = f"{stat.etag}-{codec if passthrough else 'identity'}"
+            size = content.file_size
+
+        def body_range(start: int = 0, length: int = 0):
+            if not codec:
+                return stream_object(minio_service, content.bucket, content.filename, start, length)
+            decoded = decode_chunks(stream_object(minio_service, content.bucket, content.filename), codec)
+            # Decoding starts at the beginning of the object, so ranges cost what precedes them
+            return slice_chunks(decoded, start, length) if length else decoded
+
+        headers = {
+            "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}",
+            "Accept-Ranges": "bytes",
+            "ETag": quote_etag(etag),
+        }
+        if codec:
+            headers["Vary"] = "Accept-Encoding"
+        if stat.last_modified:
+            headers["Last-Modified"] = http_date(stat.last_modified)
+
+        if is_not_modified(request.headers, etag, stat.last_modified):
+            headers.pop("Content-Disposition")
+            return Response(status_code=304, headers=headers)
+
+        if passthrough:
+            headers["Content-Encoding"] = codec
+            headers["Content-Length"] = str(stat.size)
+            return StreamingResponse(
+                stream_object(minio_service, content.bucket, content.filename),
+                media_type=media_type,
+                headers=headers
+            )
+
+        ranges = None
+        if range_applies(request.headers, etag, stat.last_modified):
             try:
-                total_bytes = 0
-                while True:
-                    data = response.read(8192)  # Read in 8KB chunks
-                    if not data:
-                        break
-                    total_bytes += len(data)
-                    logger.info(f"Sending chunk: {len(data)} bytes, total: {total_bytes}")
+                ranges = parse_range_header(request.headers.get("range"), size)
+            except RangeNotSatisfiable:
+                return Response(status_code=416, headers={"Content-Range": f"bytes */{size}"})
+
+        if not ranges:
+            headers["Content-Length"] = str(size)
+            return StreamingResponse(body_range(), media_type=media_type, headers=headers)
+
+        if len(ranges) == 1:
+            start, end = ranges[0]
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                body_range(start, end - start + 1),
+                status_code=206,
+                media_type=media_type,
+                headers=headers
+            )
+
+        boundary = uuid.uuid4().hex
+        part_headers, closing, body_length = multipart_byteranges(ranges, size, media_type, boundary)
+
+        async def byteranges_generator():
+            for (start, end), part_header in zip(ranges, part_headers):
+                yield part_header
+                async for data in body_range(start, end - start + 1):
                     yield data
-            finally:
-                response.close()
-                response.release_conn()
+            yield closing
 
-        encoded_filename = urllib.parse.quote(content.original_name)
+        headers["Content-Length"] = str(body_length)
         return StreamingResponse(
-            file_generator(),
-            media_type=content.mime_type or "application/octet-stream",
-            headers={
-                "Content-Disposition": f"attachment; filename*=UTF-8''{encoded_filename}"
-            }
+            byteranges_generator(),
+            status_code=206,
+            media_type=f"multipart/byteranges; boundary={boundary}",
+            headers=headers
         )
         
     except S3Error as e:
@@ -388,105 +927,287 @@ async def download_file(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/download/archive")
+async def download_archive(
+    request: ContentArchiveRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Download several files as one ZIP archive, by ids or by creation time.
+
+    The archive is built as it is sent: each object is read from MinIO and
+    written straight into the response, one after another. Media that is
+    already compressed is stored as is, text-like files are deflated.
+    Files missing from storage are left out of the archive.
+    """
+    if request.ids and (request.created_after or request.created_before):
+        raise HTTPException(status_code=400, detail="Pass either ids or a filter, not both")
+
+    columns = (Content.id, Content.original_name, Content.bucket, Content.filename, Content.file_size,
+               Content.mime_type, Content.storage_codec, Content.created_at)
+    query = select(Content).options(load_only(*columns)).where(
+        Content.user_id == current_user.id,
+        Content.content_type == ContentType.FILE,
+        Content.status == ContentStatus.READY
+    )
+    if request.ids:
+        query = query.where(Content.id.in_(request.ids))
+    if request.created_after:
+        query = query.where(Content.created_at >= naive_utc(request.created_after))
+    if request.created_before:
+        query = query.where(Content.created_at < naive_utc(request.created_before))
+
+    contents = (await db.scalars(query.order_by(Content.created_at, Content.id))).all()
+    if not contents:
+        raise HTTPException(status_code=404, detail="No files to download")
+    if request.ids:
+        # Keep the order the client selected the files in
+        position = {content_id: index for index, content_id in enumerate(request.ids)}
+        contents = sorted(contents, key=lambda content: position[content.id])
+
+    minio_service = get_minio_service()
+
+    async def archive_generator():
+        archive = ZipStream()
+        for content in contents:
+            # Opened before the entry is started, so a missing object can still be skipped
+            try:
+                response = await run_storage(minio_service.client.get_object, content.bucket, content.filename)
+            except S3Error as e:
+                logger.warning(f"Leaving {content.id} out of archive: {e}")
+                continue
+            chunks = iter_object_response(response)
+            if content.storage_codec:
+                chunks = decode_chunks(chunks, content.storage_codec)
+            async for data in archive.add(content.original_name, chunks, mime_type=content.mime_type,
+                                          size=content.file_size, modified=content.created_at,
+                                          fallback=content.filename or content.id):
+                yield data
+        yield archive.close()
+
+    archive_name = f"localvault-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.zip"
+    return StreamingResponse(
+        archive_generator(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}"'}
+    )
+
+
 @router.get("/{content_id}", response_model=ContentResponse)
 async def get_content(
     content_id: str,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get specific content by ID (for copying text content)"""
     
-    content = db.query(Content).filter(
+    content = await db.scalar(select(Content).where(
         Content.id == content_id,
-        Content.user_id == current_user.id
-    ).first()
+        Content.user_id == current_user.id,
+        Content.status == ContentStatus.READY
+    ))
     
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
+
+    text_content = None
+    if content.content_type == ContentType.TEXT:
+        try:
+            text_content = await TextStoreService.load(db, content)
+        except S3Error as e:
+            app_logger.exceptionlogs(f"MinIO error loading text {content.id}: {e}")
+            raise HTTPException(status_code=404, detail="Text not found in storage")
     
-    response_data = ContentResponse(
-        id=content.id,
-        content_type=ContentTypeEnum.FILE if content.content_type == ContentType.FILE else ContentTypeEnum.TEXT,
-        title=content.title,
-        tags=json.loads(content.tags) if content.tags else None,
-        created_at=content.created_at,
-        updated_at=content.updated_at,
-        text_content=content.text_content,
-        filename=content.filename,
-        original_name=content.original_name,
-        bucket=content.bucket,
-        file_size=content.file_size,
-        mime_type=content.mime_type,
-        download_url=f"/api/v1/content/download/{content.id}" if content.content_type == ContentType.FILE else None
-    )
-    
-    return response_data
+    return content_response(content, text_content)
 
 
 @router.delete("/{content_id}")
 async def delete_content(
     content_id: str,
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete content and associated file if applicable"""
     
-    content = db.query(Content).filter(
+    content = await db.scalar(select(Content).where(
         Content.id == content_id,
         Content.user_id == current_user.id
-    ).first()
+    ))
     
     if not content:
         raise HTTPException(status_code=404, detail="Content not found")
     
-    # Delete file from MinIO if it's a file content
+    # Files without a blob own their object outright
+    object_to_remove = None
     if content.content_type == ContentType.FILE and content.bucket and content.filename:
+        object_to_remove = (content.bucket, content.filename)
+
+    elif content.content_type == ContentType.TEXT:
+        object_to_remove = await TextStoreService.discard(db, content)
+
+    # Delete from database
+    await ContentStatsService.record_removed(db, content)
+    await ChangeService.record_deleted(db, current_user.id, [content])
+    await db.delete(content)
+    if content.blob_id:
+        # Deduplicated files only remove the object with the last reference
+        await db.flush()
+        object_to_remove = await BlobService.release(db, content.blob_id)
+    await db.commit()
+
+    # Delete file from MinIO once nothing references it
+    if object_to_remove:
         try:
-            minio_service = MinIOService()
-            minio_service.client.remove_object(content.bucket, content.filename)
-            logger.info(f"File deleted from MinIO: {content.bucket}/{content.filename}")
+            minio_service = get_minio_service()
+            await run_storage(minio_service.client.remove_object, *object_to_remove)
+            logger.info(f"File deleted from MinIO: {object_to_remove[0]}/{object_to_remove[1]}")
         except S3Error as e:
             logger.warning(f"Failed to delete file from MinIO: {e}")
     
-    # Delete from database
-    db.delete(content)
-    db.commit()
-    
     logger.info(f"Content deleted: {content_id} by user {current_user.phone_number}")
     
     return {"message": "Content deleted successfully"}
 
 
+async def delete_contents_chunk(db: AsyncSession, user_id: int, contents: List[Content]) -> List[tuple]:
+    """
+    Delete one chunk of a user's content rows in the caller's transaction:
+    one DELETE ... WHERE id IN, the stats update and blob releases.
+    Returns the (bucket, object_name) pairs to remove from MinIO after commit.
+    """
+    objects = await TextStoreService.discard_many(
+        db, [content for content in contents if content.content_type == ContentType.TEXT]
+    )
+    blob_references = {}
+    for content in contents:
+        if content.content_type != ContentType.FILE:
+            continue
+        if content.blob_id:
+            blob_references[content.blob_id] = blob_references.get(content.blob_id, 0) + 1
+        elif content.bucket and content.filename:
+            # Files without a blob own their object outright
+            objects.append((content.bucket, content.filename))
+
+    await ContentStatsService.record_removed_many(db, user_id, contents)
+    await ChangeService.record_deleted(db, user_id, contents)
+    await db.execute(
+        delete(Content).where(Content.id.in_([content.id for content in contents]))
+        .execution_options(synchronize_session=False)
+    )
+    # Deduplicated files only remove the object with the last reference
+    for blob_id, references in blob_references.items():
+        released = await BlobService.release(db, blob_id, references)
+        if released:
+            objects.append(released)
+    return objects
+
+
+@router.post("/bulk-delete", response_model=BulkDeleteResponse)
+async def bulk_delete_content(
+    request: BulkDeleteRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete many content items at once, by ids or by filter
+    (e.g. content_type=text with older_than for "all text older than X").
+
+    Rows are deleted BULK_DELETE_CHUNK_SIZE at a time, each chunk in its own
+    transaction, and their objects removed with MinIO's multi-object delete.
+    results has one entry per requested id, or per deleted item for a filter.
+    """
+    if request.ids and (request.content_type or request.older_than):
+        raise HTTPException(status_code=400, detail="Pass either ids or a filter, not both")
+    if not request.ids and not (request.content_type or request.older_than):
+        raise HTTPException(status_code=400, detail="Pass ids or at least one of content_type, older_than")
+
+    columns = (Content.id, Content.user_id, Content.content_type, Content.status, Content.file_size,
+               Content.bucket, Content.filename, Content.blob_id, Content.text_storage)
+    query = select(Content).options(load_only(*columns)).where(Content.user_id == current_user.id)
+
+    if request.ids:
+        requested = list(dict.fromkeys(request.ids))
+        chunks = [requested[i:i + BULK_DELETE_CHUNK_SIZE] for i in range(0, len(requested), BULK_DELETE_CHUNK_SIZE)]
+    else:
+        requested = None
+        query = query.where(Content.status == ContentStatus.READY)
+        if request.content_type:
+            query = query.where(Content.content_type == (
+                ContentType.FILE if request.content_type == ContentTypeEnum.FILE else ContentType.TEXT
+            ))
+        if request.older_than:
+            query = query.where(Content.created_at < naive_utc(request.older_than))
+        chunks = None
+
+    minio_service = get_minio_service()
+    deleted_ids = []
+    processed = set()  # Requested ids whose chunk completed
+
+    async def delete_batch(contents):
+        objects = await delete_contents_chunk(db, current_user.id, contents)
+        await db.commit()
+        deleted_ids.extend(content.id for content in contents)
+        if objects:
+            try:
+                await run_storage(minio_service.remove_objects, objects)
+            except S3Error as e:
+                logger.warning(f"Failed to delete objects from MinIO: {e}")
+
+    try:
+        if chunks is not None:
+            for chunk in chunks:
+                contents = (await db.scalars(query.where(Content.id.in_(chunk)))).all()
+                if contents:
+                    await delete_batch(contents)
+                processed.update(chunk)
+        else:
+            # Deleted rows drop out of the filter, so keep taking the first chunk
+            while True:
+                contents = (await db.scalars(query.order_by(Content.created_at, Content.id).limit(BULK_DELETE_CHUNK_SIZE))).all()
+                if not contents:
+                    break
+                await delete_batch(contents)
+    except Exception as e:
+        await db.rollback()
+        app_logger.exceptionlogs(f"Error in bulk delete after {len(deleted_ids)} items: {e}")
+        if not deleted_ids:
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+    deleted = set(deleted_ids)
+    if requested is None:
+        results = [BulkDeleteItemResult(id=content_id, deleted=True) for content_id in deleted_ids]
+    else:
+        results = [
+            BulkDeleteItemResult(id=content_id, deleted=True) if content_id in deleted
+            else BulkDeleteItemResult(id=content_id, deleted=False,
+                                      error="Content not found" if content_id in processed else "Delete failed")
+            for content_id in requested
+        ]
+
+    logger.info(f"Bulk deleted {len(deleted_ids)} items for user {current_user.phone_number}")
+
+    return BulkDeleteResponse(results=results, deleted=len(deleted_ids))
+
+
 @router.get("/stats/summary")
 async def get_content_stats(
     current_user = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get content statistics for the current user"""
     
-    total_content = db.query(Content).filter(Content.user_id == current_user.id).count()
-    text_content = db.query(Content).filter(
-        Content.user_id == current_user.id,
-        Content.content_type == ContentType.TEXT
-    ).count()
-    file_content = db.query(Content).filter(
-        Content.user_id == current_user.id,
-        Content.content_type == ContentType.FILE
-    ).count()
-    
-    # Calculate total file size
-    total_file_size = db.query(Content).filter(
-        Content.user_id == current_user.id,
-        Content.content_type == ContentType.FILE
-    ).with_entities(Content.file_size).all()
-    
-    total_size_bytes = sum(size[0] for size in total_file_size if size[0])
-    total_size_mb = round(total_size_bytes / (1024 * 1024), 2)
+    # Counters are maintained on every upload/delete, so this is a single primary-key read
+    stats = await ContentStatsService.get_stats(db, current_user.id)
+    text_content = stats.text_count if stats else 0
+    file_content = stats.file_count if stats else 0
+    total_size_mb = round((stats.total_bytes if stats else 0) / (1024 * 1024), 2)
     
     return {
-        "total_content": total_content,
+        "total_content": text_content + file_content,
         "text_content": text_content,
         "file_content": file_content,
         "total_file_size_mb": total_size_mb,
+        "last_modified": stats.last_modified if stats else None,
         "user_phone": current_user.phone_number
     }
@@ -3,7 +3,8 @@ from fastapi.params import Query
 from fastapi.responses import StreamingResponse
 from minio import S3Error
 
-from utils.minio_conn import MinIOService
+from utils.executor import run_storage
+from utils.minio_conn import get_minio_service, iter_object_response
 
 router = APIRouter(prefix="/download", tags=["Download"])
 
@@ -11,22 +12,11 @@ router = APIRouter(prefix="/download", tags=["Download"])
 async def download_extension():
     """Download Chrome Extension"""
     try:
-        minio_service = MinIOService()
-        response = minio_service.client.get_object("downloads", "localvault-extension.zip")
-
-        def file_generator():
-            try:
-                while True:
-                    data = response.read(8192)
-                    if not data:
-                        break
-                    yield data
-            finally:
-                response.close()
-                response.release_conn()
+        minio_service = get_minio_service()
+        response = await run_storage(minio_service.client.get_object, "downloads", "localvault-extension.zip")
 
         return StreamingResponse(
-            file_generator(),
+            iter_object_response(response),
             media_type="application/zip",
             headers={"Content-Disposition": "attachment; filename=localvault-extension.zip"}
         )
@@ -52,25 +42,14 @@ async def download_mobile(platform: str = Query(..., description="Platform: ios
             filename = "localvault-android.apk"  # or .zip if source code
             download_name = "localvault-android.apk"
 
-        minio_service = MinIOService()
-        response = minio_service.client.get_object("downloads", filename)
-
-        def file_generator():
-            try:
-                while True:
-                    data = response.read(8192)
-                    if not data:
-                        break
-                    yield data
-            finally:
-                response.close()
-                response.release_conn()
+        minio_service = get_minio_service()
+        response = await run_storage(minio_service.client.get_object, "downloads", filename)
 
         # Set appropriate media type
         media_type = "application/vnd.android.package-archive" if platform == "android" else "application/zip"
 
         return StreamingResponse(
-            file_generator(),
+            iter_object_response(response),
             media_type=media_type,
             headers={"Content-Disposition": f"attachment; filename={download_name}"}
         )
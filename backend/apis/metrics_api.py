@@ -0,0 +1,33 @@
+import os
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from utils.executor import executor_stats
+from utils.minio_conn import get_minio_service
+
+# Shared secret for the metrics endpoints; unset disables them
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+def require_metrics_token(x_metrics_token: str = Header(None)):
+    """Only callers holding METRICS_TOKEN (X-Metrics-Token header) may read pool internals"""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_metrics_token or not secrets.compare_digest(x_metrics_token, METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid metrics token")
+
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"], dependencies=[Depends(require_metrics_token)])
+
+
+@router.get("/storage-pool")
+async def storage_pool_stats():
+    """Connection pool usage of this worker's MinIO client, for sizing MINIO_POOL_MAXSIZE"""
+    return get_minio_service().http_client.pool_stats()
+
+
+@router.get("/executors")
+async def executors_stats():
+    """Queue depth and wait times of the blocking-call executors"""
+    return executor_stats()
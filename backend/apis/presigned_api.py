@@ -0,0 +1,182 @@
+import urllib.parse
+import uuid
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import RedirectResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from minio.error import S3Error
+
+from db.db_conn import get_async_db
+from db.models import Content, ContentType, ContentStatus
+from db.schema import (
+    ContentResponse,
+    PresignedUploadRequest,
+    PresignedUploadResponse,
+    PresignedDownloadResponse
+)
+from services.stats_service import ContentStatsService
+from services.change_service import ChangeService
+from utils import app_logger
+from utils.content_serializer import content_response
+from utils.dependencies import get_current_user
+from utils.executor import run_storage
+from utils.minio_conn import get_minio_service, PRESIGNED_URL_EXPIRY
+from apis.content_api import ALLOWED_FILE_TYPES, serialize_tags
+from apis.upload_api import MAX_SESSION_UPLOAD_SIZE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/content/presigned", tags=["Presigned Transfers"])
+
+
+@router.post("/upload", response_model=PresignedUploadResponse)
+async def request_upload_url(
+    request: PresignedUploadRequest,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Record a pending file and return a short-lived URL to PUT it to MinIO directly.
+
+    The file stays hidden until POST /content/presigned/{content_id}/confirm
+    is called after the upload finishes. Unconfirmed files are removed by
+    commands.reap_pending_uploads once the URL has expired.
+    """
+    mime_type = request.mime_type or "application/octet-stream"
+    if mime_type not in ALLOWED_FILE_TYPES:
+        raise HTTPException(status_code=415, detail=f"File type {mime_type} not allowed")
+
+    if request.file_size is not None and request.file_size > MAX_SESSION_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size allowed is {MAX_SESSION_UPLOAD_SIZE // (1024*1024)}MB"
+        )
+
+    content_id = str(uuid.uuid4())
+    bucket = str(current_user.phone_number)
+    file_extension = request.filename.split('.')[-1] if '.' in request.filename else ''
+    stored_filename = f"{content_id}.{file_extension}" if file_extension else content_id
+
+    minio_service = get_minio_service()
+
+    def presign_upload(bucket_name):
+        # Presigning never reaches MinIO, so a bucket deleted behind the cache would only
+        # fail the client's PUT: check it here and let with_user_bucket recreate it
+        if not minio_service.client.bucket_exists(bucket_name):
+            raise S3Error("NoSuchBucket", "The specified bucket does not exist", bucket_name,
+                          None, None, None, bucket_name)
+        return bucket_name, minio_service.presigned_upload_url(bucket_name, stored_filename)
+
+    try:
+        bucket_name, upload_url = await run_storage(minio_service.with_user_bucket, bucket, presign_upload)
+    except S3Error as e:
+        app_logger.exceptionlogs(f"MinIO error presigning upload: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to prepare upload: {str(e)}")
+
+    content = Content(
+        id=content_id,
+        content_type=ContentType.FILE,
+        status=ContentStatus.PENDING,
+        title=request.title or request.filename,
+        tags=serialize_tags(request.tags),
+        user_id=current_user.id,
+        filename=stored_filename,
+        original_name=request.filename,
+        bucket=bucket_name,
+        file_path=f"{bucket}/{stored_filename}",
+        file_size=request.file_size,
+        mime_type=mime_type
+    )
+
+    db.add(content)
+    await db.commit()
+
+    return PresignedUploadResponse(
+        content_id=content_id,
+        upload_url=upload_url,
+        headers={"Content-Type": mime_type},
+        expires_in=int(PRESIGNED_URL_EXPIRY.total_seconds())
+    )
+
+
+@router.post("/{content_id}/confirm", response_model=ContentResponse)
+async def confirm_upload(
+    content_id: str,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Finalise a pending file once its object has landed in MinIO"""
+    content = await db.scalar(select(Content).where(
+        Content.id == content_id,
+        Content.user_id == current_user.id,
+        Content.content_type == ContentType.FILE
+    ))
+
+    if not content:
+        raise HTTPException(status_code=404, detail="File content not found")
+
+    if content.status == ContentStatus.PENDING:
+        minio_service = get_minio_service()
+        try:
+            stat = await run_storage(minio_service.client.stat_object, content.bucket, content.filename)
+        except S3Error as e:
+            if e.code in ("NoSuchKey", "NoSuchObject"):
+                raise HTTPException(status_code=409, detail="File has not been uploaded yet")
+            app_logger.exceptionlogs(f"MinIO error confirming upload {content_id}: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+        if stat.size > MAX_SESSION_UPLOAD_SIZE:
+            await run_storage(minio_service.client.remove_object, content.bucket, content.filename)
+            await db.delete(content)
+            await db.commit()
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size allowed is {MAX_SESSION_UPLOAD_SIZE // (1024*1024)}MB"
+            )
+
+        content.file_size = stat.size
+        content.status = ContentStatus.READY
+        await ContentStatsService.record_added(db, content)
+        await ChangeService.record_changed(db, current_user.id, [content])
+        await db.commit()
+        await db.refresh(content)
+        logger.info(f"Direct upload confirmed: {content.original_name} ({stat.size} bytes) by user {current_user.phone_number}")
+
+    return content_response(content)
+
+
+@router.get("/download/{content_id}", response_model=PresignedDownloadResponse)
+async def request_download_url(
+    content_id: str,
+    redirect: bool = False,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Return a short-lived URL to GET the file from MinIO directly, or redirect to it"""
+    content = await db.scalar(select(Content).where(
+        Content.id == content_id,
+        Content.user_id == current_user.id,
+        Content.content_type == ContentType.FILE,
+        Content.status == ContentStatus.READY
+    ))
+
+    if not content:
+        raise HTTPException(status_code=404, detail="File content not found")
+
+    download_url = get_minio_service().presigned_download_url(
+        content.bucket,
+        content.filename,
+        download_name=urllib.parse.quote(content.original_name or content.filename)
+    )
+
+    if redirect:
+        return RedirectResponse(download_url, status_code=307)
+
+    return PresignedDownloadResponse(
+        content_id=content.id,
+        download_url=download_url,
+        expires_in=int(PRESIGNED_URL_EXPIRY.total_seconds())
+    )
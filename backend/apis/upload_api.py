@@ -0,0 +1,297 @@
+import os
+import tempfile
+import uuid
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from minio.error import S3Error
+from minio.helpers import MIN_PART_SIZE
+
+from db.db_conn import get_async_db
+from db.models import Content, ContentType
+from db.schema import (
+    ContentResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
+    UploadPartResponse
+)
+from services.upload_session_service import UploadSessionService
+from services.stats_service import ContentStatsService
+from services.change_service import ChangeService
+from utils import app_logger
+from utils.content_serializer import content_response
+from utils.dependencies import get_current_user
+from utils.executor import run_storage
+from utils.minio_conn import get_minio_service
+from apis.content_api import ALLOWED_FILE_TYPES, serialize_tags
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/content/uploads", tags=["Upload Sessions"])
+
+# Session uploads are not held in memory, so they get a much larger cap than /content/upload
+MAX_SESSION_UPLOAD_SIZE = int(os.getenv("MAX_SESSION_UPLOAD_SIZE", 5 * 1024 * 1024 * 1024))  # 5GB
+
+# Every part except the last must be at least MIN_PART_SIZE (5MB)
+MAX_PART_SIZE = 64 * 1024 * 1024  # 64MB
+MAX_PART_NUMBER = 10000
+# Part bodies beyond this many bytes are spooled to a temporary file, not memory
+PART_SPOOL_MEMORY = 1024 * 1024  # 1MB
+
+
+def build_session_response(session_id: str, session: dict, parts: dict) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        session_id=session_id,
+        filename=session["filename"],
+        mime_type=session["mime_type"] or None,
+        total_size=int(session["total_size"]) if session["total_size"] else None,
+        part_size=MIN_PART_SIZE,
+        max_part_size=MAX_PART_SIZE,
+        parts=[
+            UploadPartResponse(part_number=number, etag=part["etag"], size=part["size"])
+            for number, part in parts.items()
+        ],
+        received_bytes=sum(part["size"] for part in parts.values())
+    )
+
+
+async def get_session_or_404(session_id: str, current_user) -> dict:
+    session = await run_storage(UploadSessionService.get_session, session_id, current_user.id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+
+@router.post("", response_model=UploadSessionResponse)
+async def initiate_upload(
+    request: UploadSessionCreate,
+    current_user = Depends(get_current_user)
+):
+    """
+    Start a resumable upload session backed by a MinIO multipart upload.
+
+    Upload parts with PUT /content/uploads/{session_id}/parts/{part_number},
+    then call complete. The session id becomes the content id.
+    """
+    mime_type = request.mime_type or "application/octet-stream"
+    if mime_type not in ALLOWED_FILE_TYPES:
+        raise HTTPException(status_code=415, detail=f"File type {mime_type} not allowed")
+
+    if request.total_size is not None and request.total_size > MAX_SESSION_UPLOAD_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size allowed is {MAX_SESSION_UPLOAD_SIZE // (1024*1024)}MB"
+        )
+
+    session_id = str(uuid.uuid4())
+    file_extension = request.filename.split('.')[-1] if '.' in request.filename else ''
+    stored_filename = f"{session_id}.{file_extension}" if file_extension else session_id
+
+    minio_service = get_minio_service()
+
+    def start_upload(bucket_name):
+        return bucket_name, minio_service.multipart.create(bucket_name, stored_filename, mime_type)
+
+    try:
+        bucket_name, upload_id = await run_storage(
+            minio_service.with_user_bucket, str(current_user.phone_number), start_upload
+        )
+    except S3Error as e:
+        app_logger.exceptionlogs(f"MinIO error starting upload session: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to start upload: {str(e)}")
+
+    session = await run_storage(UploadSessionService.create_session, session_id, {
+        "user_id": current_user.id,
+        "upload_id": upload_id,
+        "bucket": bucket_name,
+        "stored_filename": stored_filename,
+        "filename": request.filename,
+        "mime_type": mime_type,
+        "total_size": request.total_size or "",
+        "title": request.title or "",
+        "tags": serialize_tags(request.tags) or ""
+    })
+
+    logger.info(f"Upload session {session_id} started for {request.filename} by user {current_user.phone_number}")
+    return build_session_response(session_id, {k: str(v) for k, v in session.items()}, {})
+
+
+@router.put("/{session_id}/parts/{part_number}", response_model=UploadPartResponse)
+async def upload_part(
+    session_id: str,
+    part_number: int,
+    request: Request,
+    current_user = Depends(get_current_user)
+):
+    """Upload one part as the raw request body. Re-sending a part number replaces it."""
+    if part_number < 1 or part_number > MAX_PART_NUMBER:
+        raise HTTPException(status_code=400, detail=f"Part number must be between 1 and {MAX_PART_NUMBER}")
+
+    session = await get_session_or_404(session_id, current_user)
+    if await run_storage(UploadSessionService.is_completing, session_id):
+        raise HTTPException(status_code=409, detail="Upload session is being completed")
+
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Part too large. Maximum part size is {MAX_PART_SIZE // (1024*1024)}MB"
+    )
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_PART_SIZE:
+        raise too_large
+
+    # Spooled like a multipart form file, then streamed to MinIO from there
+    body = UploadFile(tempfile.SpooledTemporaryFile(max_size=PART_SPOOL_MEMORY), size=0)
+    try:
+        async for chunk in request.stream():
+            if body.size + len(chunk) > MAX_PART_SIZE:
+                raise too_large
+            await body.write(chunk)
+        size = body.size
+
+        if not size:
+            raise HTTPException(status_code=400, detail="Part body is empty")
+
+        parts = await run_storage(UploadSessionService.get_parts, session_id)
+        received = sum(part["size"] for number, part in parts.items() if number != part_number)
+        if received + size > MAX_SESSION_UPLOAD_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size allowed is {MAX_SESSION_UPLOAD_SIZE // (1024*1024)}MB"
+            )
+
+        await body.seek(0)
+        minio_service = get_minio_service()
+        etag = await run_storage(
+            minio_service.multipart.upload_part,
+            session["bucket"],
+            session["stored_filename"],
+            session["upload_id"],
+            part_number,
+            body.file,
+            size
+        )
+    except S3Error as e:
+        app_logger.exceptionlogs(f"MinIO error uploading part {part_number} of {session_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to upload part: {str(e)}")
+    finally:
+        await body.close()
+
+    await run_storage(UploadSessionService.record_part, session_id, part_number, etag, size)
+    return UploadPartResponse(part_number=part_number, etag=etag, size=size)
+
+
+@router.get("/{session_id}", response_model=UploadSessionResponse)
+async def get_upload_session(
+    session_id: str,
+    current_user = Depends(get_current_user)
+):
+    """List the parts received so far, so a client can resend only the missing ones"""
+    session = await get_session_or_404(session_id, current_user)
+    parts = await run_storage(UploadSessionService.get_parts, session_id)
+    return build_session_response(session_id, session, parts)
+
+
+@router.post("/{session_id}/complete", response_model=ContentResponse)
+async def complete_upload(
+    session_id: str,
+    current_user = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Assemble the uploaded parts into the final object and create its content record"""
+    session = await get_session_or_404(session_id, current_user)
+    # Only one request may assemble the object; parts are refused from here on
+    if not await run_storage(UploadSessionService.claim_completion, session_id):
+        raise HTTPException(status_code=409, detail="Upload session is already being completed")
+
+    try:
+        parts = await run_storage(UploadSessionService.get_parts, session_id)
+
+        if not parts:
+            raise HTTPException(status_code=400, detail="No parts uploaded")
+
+        missing = [number for number in range(1, max(parts) + 1) if number not in parts]
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Missing parts: {missing}")
+
+        too_small = [number for number, part in parts.items()
+                     if number != max(parts) and part["size"] < MIN_PART_SIZE]
+        if too_small:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Parts {too_small} are smaller than {MIN_PART_SIZE // (1024*1024)}MB; only the last part may be"
+            )
+
+        file_size = sum(part["size"] for part in parts.values())
+        if session["total_size"] and file_size != int(session["total_size"]):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Received {file_size} bytes, expected {session['total_size']}"
+            )
+
+        try:
+            minio_service = get_minio_service()
+            await run_storage(
+                minio_service.multipart.complete,
+                session["bucket"],
+                session["stored_filename"],
+                session["upload_id"],
+                [(number, part["etag"]) for number, part in parts.items()]
+            )
+        except S3Error as e:
+            app_logger.exceptionlogs(f"MinIO error completing upload session {session_id}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to complete upload: {str(e)}")
+
+        content = Content(
+            id=session_id,
+            content_type=ContentType.FILE,
+            title=session["title"] or session["filename"],
+            tags=session["tags"] or None,
+            user_id=current_user.id,
+            filename=session["stored_filename"],
+            original_name=session["filename"],
+            bucket=session["bucket"],
+            file_path=f"{current_user.phone_number}/{session['stored_filename']}",
+            file_size=file_size,
+            mime_type=session["mime_type"]
+        )
+
+        db.add(content)
+        await ContentStatsService.record_added(db, content)
+        await ChangeService.record_changed(db, current_user.id, [content])
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="Upload session was already completed")
+        await db.refresh(content)
+    except BaseException:
+        await run_storage(UploadSessionService.release_completion, session_id)
+        raise
+
+    await run_storage(UploadSessionService.delete_session, session_id)
+    logger.info(f"Upload session {session_id} completed: {session['filename']} ({file_size} bytes)")
+
+    return content_response(content)
+
+
+@router.delete("/{session_id}")
+async def abort_upload(
+    session_id: str,
+    current_user = Depends(get_current_user)
+):
+    """Abort an upload session and discard its parts"""
+    session = await get_session_or_404(session_id, current_user)
+
+    try:
+        minio_service = get_minio_service()
+        await run_storage(
+            minio_service.multipart.abort, session["bucket"], session["stored_filename"], session["upload_id"]
+        )
+    except S3Error as e:
+        logger.warning(f"Failed to abort multipart upload for session {session_id}: {e}")
+
+    await run_storage(UploadSessionService.delete_session, session_id)
+    return {"message": "Upload session aborted"}
@@ -0,0 +1,105 @@
+"""
+Per-row cost of serializing a content list page: hand-built models vs orjson payloads.
+
+"before" mirrors the previous list_content: a ContentResponse built field by
+field with json.loads on tags, wrapped in ContentListResponse, then validated
+again against response_model and rendered by FastAPI's JSONResponse.
+"after" is utils.content_serializer rendered by ORJSONResponse.
+
+Usage: python -m benchmarks.content_serialization [--rows 50] [--rounds 2000]
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.utils import create_model_field
+
+from db.models import Content, ContentType
+from db.schema import ContentListResponse, ContentResponse, ContentTypeEnum
+from utils.content_serializer import CONTENT_FIELDS, serialize_contents
+
+
+def make_rows(count):
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        is_file = i % 2 == 0
+        rows.append(Content(
+            id=str(uuid.uuid4()),
+            content_type=ContentType.FILE if is_file else ContentType.TEXT,
+            title=f"Item {i}",
+            tags=json.dumps(["work", f"tag{i}"]),
+            text_content=None if is_file else "clipboard text " * 40,
+            filename=f"{i}.pdf" if is_file else None,
+            original_name=f"report-{i}.pdf" if is_file else None,
+            bucket="user-5550000000" if is_file else None,
+            file_size=123456 if is_file else None,
+            mime_type="application/pdf" if is_file else None,
+            created_at=now,
+            updated_at=now,
+        ))
+    return rows
+
+
+def before(rows, field):
+    responses = []
+    for content in rows:
+        responses.append(ContentResponse(
+            id=content.id,
+            content_type=ContentTypeEnum.FILE if content.content_type == ContentType.FILE else ContentTypeEnum.TEXT,
+            title=content.title,
+            tags=json.loads(content.tags) if content.tags else None,
+            created_at=content.created_at,
+            updated_at=content.updated_at,
+            text_content=content.text_content,
+            filename=content.filename,
+            original_name=content.original_name,
+            bucket=content.bucket,
+            file_size=content.file_size,
+            mime_type=content.mime_type,
+            download_url=f"/api/v1/content/download/{content.id}" if content.content_type == ContentType.FILE else None
+        ))
+    page = ContentListResponse(contents=responses, total_count=None, next_cursor=None)
+    # What fastapi.routing.serialize_response does with a returned model when response_model is set
+    value, _ = field.validate(page, {}, loc=("response",))
+    return JSONResponse(field.serialize(value)).body
+
+
+def after(rows, field):
+    texts = {content.id: content.text_content for content in rows if content.text_content}
+    return ORJSONResponse({
+        "contents": serialize_contents(rows, CONTENT_FIELDS, texts),
+        "total_count": None,
+        "next_cursor": None,
+    }).body
+
+
+def measure(fn, rows, field, rounds):
+    fn(rows, field)  # warm up
+    started = time.perf_counter()
+    for _ in range(rounds):
+        body = fn(rows, field)
+    elapsed = time.perf_counter() - started
+    return elapsed / (rounds * len(rows)) * 1e6, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    field = create_model_field(name="Response_list_content", type_=ContentListResponse, mode="serialization")
+
+    print(f"{args.rows} rows per page, {args.rounds} pages")
+    for name, fn in (("before", before), ("after", after)):
+        per_row, size = measure(fn, rows, field, args.rounds)
+        print(f"{name:>6}: {per_row:7.2f} us/row, {size} bytes/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Peak memory of concurrent file uploads: buffered vs streamed ingest.
+
+Simulates N concurrent uploads of a spooled file (the same
+SpooledTemporaryFile starlette hands to UploadFile) being consumed by
+MinIO's part reader, and reports the tracemalloc peak for both paths.
+
+Usage: python -m benchmarks.upload_memory [--uploads 50] [--size-mb 20]
+"""
+import argparse
+import io
+import os
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+from minio.helpers import read_part_data
+
+from utils.upload_stream import UploadStream, UPLOAD_PART_SIZE
+
+SPOOL_MAX_SIZE = 1024 * 1024  # starlette's in-memory threshold
+
+
+def make_spool(size):
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    block = os.urandom(1024 * 1024)
+    written = 0
+    while written < size:
+        chunk = block[:min(len(block), size - written)]
+        spool.write(chunk)
+        written += len(chunk)
+    spool.seek(0)
+    return spool
+
+
+def drain(stream, length, part_size):
+    """Consume a stream the way Minio.put_object does, one part at a time"""
+    uploaded = 0
+    while uploaded < length:
+        part = read_part_data(stream, min(part_size, length - uploaded))
+        if not part:
+            break
+        uploaded += len(part)
+    return uploaded
+
+
+def buffered_upload(spool, size, barrier):
+    barrier.wait()
+    file_content = spool.read()
+    file_stream = io.BytesIO(file_content)
+    return drain(file_stream, len(file_content), 10 * 1024 * 1024)
+
+
+def streamed_upload(spool, size, barrier):
+    barrier.wait()
+    file_stream = UploadStream(spool, max_size=size)
+    return drain(file_stream, size, UPLOAD_PART_SIZE)
+
+
+def measure(upload, uploads, size):
+    spools = [make_spool(size) for _ in range(uploads)]
+    barrier = Barrier(uploads)
+    tracemalloc.start()
+    try:
+        with ThreadPoolExecutor(max_workers=uploads) as pool:
+            results = list(pool.map(lambda s: upload(s, size, barrier), spools))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        for spool in spools:
+            spool.close()
+    assert all(r == size for r in results)
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=50)
+    parser.add_argument("--size-mb", type=int, default=20)
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    mb = 1024 * 1024
+    for name, upload in (("buffered", buffered_upload), ("streamed", streamed_upload)):
+        peak = measure(upload, args.uploads, size)
+        print(f"{name:>9}: {args.uploads} x {args.size_mb}MB uploads, "
+              f"peak {peak / mb:.1f}MB ({peak / args.uploads / mb:.1f}MB per upload)")
+
+
+if __name__ == "__main__":
+    main()
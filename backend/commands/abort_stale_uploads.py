@@ -0,0 +1,57 @@
+"""
+Abort MinIO multipart uploads whose upload session has expired from Redis, so
+abandoned resumable uploads stop holding their parts in storage. Run it
+periodically, e.g. hourly from cron:
+
+    python -m commands.abort_stale_uploads
+    python -m commands.abort_stale_uploads --dry-run
+
+Uploads started less than UPLOAD_SESSION_TTL ago are left alone, which also
+spares multipart uploads that put_object has in flight.
+"""
+import argparse
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+load_dotenv('.env')
+
+from minio.error import S3Error
+
+from services.upload_session_service import UPLOAD_SESSION_TTL, UploadSessionService
+from utils.minio_conn import get_minio_service
+
+
+def abort_stale(minio_service, dry_run: bool = False) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=UPLOAD_SESSION_TTL)
+    aborted = 0
+    for bucket_name in minio_service.list_user_buckets():
+        for object_name, upload_id, initiated in minio_service.multipart.list_incomplete(bucket_name):
+            if initiated and initiated > cutoff:
+                continue
+            # Session uploads are stored as {session_id}.{extension}
+            if UploadSessionService.session_exists(object_name.split(".")[0]):
+                continue
+
+            print(f"Aborting {bucket_name}/{object_name} (started {initiated})")
+            if dry_run:
+                aborted += 1
+                continue
+            try:
+                minio_service.multipart.abort(bucket_name, object_name, upload_id)
+                aborted += 1
+            except S3Error as e:
+                print(f"Failed to abort {bucket_name}/{object_name}: {e}")
+    return aborted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Abort multipart uploads of expired upload sessions")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the uploads that would be aborted")
+    args = parser.parse_args()
+
+    aborted = abort_stale(get_minio_service(), args.dry_run)
+    print(f"{'Would abort' if args.dry_run else 'Aborted'} {aborted} multipart upload(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Fill contents.text_hash for text clips stored before it existed.
+
+    python -m commands.backfill_text_hash
+    python -m commands.backfill_text_hash --batch-size 1000
+    python -m commands.backfill_text_hash --rehash   # recompute existing hashes too
+
+Works through the rows in id order, one committed batch at a time, so it can be
+stopped and re-run safely.
+"""
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv('.env')
+
+from sqlalchemy import select, update, bindparam
+
+from db.db_conn import SessionLocal
+from db.models import Content
+from utils.app_helper import text_hash
+
+
+def backfill(db, batch_size: int, rehash: bool = False) -> int:
+    updated = 0
+    last_id = ""
+    while True:
+        query = select(Content.id, Content.text_content).where(Content.id > last_id, Content.text_content.is_not(None))
+        if not rehash:
+            query = query.where(Content.text_hash.is_(None))
+        rows = db.execute(
+            query
+            .order_by(Content.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return updated
+
+        db.execute(
+            update(Content.__table__).where(Content.__table__.c.id == bindparam("row_id")).values(text_hash=bindparam("hash")),
+            [{"row_id": row.id, "hash": text_hash(row.text_content)} for row in rows]
+        )
+        db.commit()
+
+        updated += len(rows)
+        last_id = rows[-1].id
+        print(f"Hashed {updated} text clips")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill contents.text_hash")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rehash", action="store_true",
+                        help="recompute every inline clip's hash, e.g. after normalize_text changed")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = backfill(db, args.batch_size, args.rehash)
+    finally:
+        db.close()
+    print(f"Done, {updated} text clips hashed")
+
+
+if __name__ == "__main__":
+    main()
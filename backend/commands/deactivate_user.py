@@ -0,0 +1,52 @@
+"""
+Deactivate a user, or let them log in again.
+
+    python -m commands.deactivate_user --user-id 7
+    python -m commands.deactivate_user --phone-number 9876543210
+    python -m commands.deactivate_user --user-id 7 --activate
+
+Deactivation drops the user's cached logins from the Redis tier of the principal
+cache; other workers' local tiers forget them within PRINCIPAL_CACHE_TTL.
+"""
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+load_dotenv('.env')
+
+from db.db_conn import AsyncSessionLocal, async_engine
+from services.user_service import UserService
+
+
+async def run(user_id: int, phone_number: str, activate: bool) -> str:
+    async with AsyncSessionLocal() as db:
+        if phone_number:
+            user = await UserService.get_user_by_phone(phone_number, db)
+            if not user:
+                return f"No user with phone number {phone_number}"
+            user_id = user.id
+
+        if activate:
+            user = await UserService.activate_user(user_id, db)
+        else:
+            user = await UserService.deactivate_user(user_id, db)
+    await async_engine.dispose()
+
+    if not user:
+        return f"User {user_id} not found"
+    return f"User {user.id} {'activated' if activate else 'deactivated'}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deactivate or reactivate a user")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--user-id", type=int)
+    target.add_argument("--phone-number")
+    parser.add_argument("--activate", action="store_true", help="Reactivate instead of deactivating")
+    args = parser.parse_args()
+
+    print(asyncio.run(run(args.user_id, args.phone_number, args.activate)))
+
+
+if __name__ == "__main__":
+    main()
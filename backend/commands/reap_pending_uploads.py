@@ -0,0 +1,64 @@
+"""
+Delete presigned uploads that were never confirmed: PENDING rows older than
+PRESIGNED_URL_EXPIRY, and their objects if the client did upload them. Run it
+periodically, e.g. hourly from cron:
+
+    python -m commands.reap_pending_uploads
+    python -m commands.reap_pending_uploads --batch-size 1000
+"""
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv('.env')
+
+from sqlalchemy import delete, select
+
+from db.db_conn import SessionLocal
+from db.models import Content, ContentStatus
+from utils import utcnow
+from utils.minio_conn import PRESIGNED_URL_EXPIRY, get_minio_service
+
+
+def reap(db, minio_service, batch_size: int) -> int:
+    cutoff = utcnow() - PRESIGNED_URL_EXPIRY
+    reaped = 0
+    while True:
+        ids = db.scalars(
+            select(Content.id)
+            .where(Content.status == ContentStatus.PENDING, Content.created_at < cutoff)
+            .limit(batch_size)
+        ).all()
+        if not ids:
+            return reaped
+
+        # Re-checked in the DELETE, so a row confirmed meanwhile is kept along with its object
+        removed = db.execute(
+            delete(Content)
+            .where(Content.id.in_(ids), Content.status == ContentStatus.PENDING)
+            .returning(Content.bucket, Content.filename)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+
+        objects = [(bucket, filename) for bucket, filename in removed if bucket and filename]
+        for bucket, filename in minio_service.remove_objects(objects):
+            print(f"Failed to remove {bucket}/{filename}")
+        reaped += len(removed)
+        print(f"Reaped {reaped} pending uploads")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete presigned uploads that were never confirmed")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        reaped = reap(db, get_minio_service(), args.batch_size)
+    finally:
+        db.close()
+    print(f"Done, {reaped} pending upload(s) reaped")
+
+
+if __name__ == "__main__":
+    main()
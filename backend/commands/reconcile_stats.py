@@ -0,0 +1,30 @@
+"""
+Rebuild per-user usage counters from the contents table.
+
+    python -m commands.reconcile_stats              # every user
+    python -m commands.reconcile_stats --user-id 7  # a single user
+"""
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv('.env')
+
+from db.db_conn import SessionLocal
+from services.stats_service import ContentStatsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild user_content_stats from contents")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user's counters")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rows = ContentStatsService.rebuild(db, user_id=args.user_id)
+    finally:
+        db.close()
+    print(f"Rebuilt usage counters for {rows} user(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Index the full body of text clips kept out of the row (compressed or in MinIO).
+Clips stored before their bodies were indexed are searchable by preview only.
+
+    python -m commands.reindex_text
+    python -m commands.reindex_text --batch-size 100
+
+Works through the rows in id order, one committed batch at a time, so it can be
+stopped and re-run safely.
+"""
+import argparse
+
+from dotenv import load_dotenv
+load_dotenv('.env')
+
+from minio.error import S3Error
+from sqlalchemy import select
+
+from db.db_conn import SessionLocal
+from db.models import Content, ContentStatus, ContentText, ContentType
+from services.search_service import SEARCH_BODY_CHARS, SearchService
+from services.text_store_service import COMPRESSED, OBJECT, decode_text
+from utils.minio_conn import get_minio_service
+
+
+def load_object_text(minio_service, content) -> str:
+    response = minio_service.client.get_object(content.bucket, content.filename)
+    try:
+        return decode_text(response.read(), content.storage_codec)
+    finally:
+        response.close()
+        response.release_conn()
+
+
+def reindex(db, batch_size: int) -> int:
+    statement = SearchService.index_body_statement(db.bind.dialect.name)
+    if statement is None:
+        print(f"{db.bind.dialect.name} has no full-text index; nothing to do")
+        return 0
+
+    minio_service = get_minio_service()
+    indexed = 0
+    last_id = ""
+    while True:
+        contents = db.scalars(
+            select(Content)
+            .where(Content.id > last_id,
+                   Content.content_type == ContentType.TEXT,
+                   Content.status == ContentStatus.READY,
+                   Content.text_storage.in_([COMPRESSED, OBJECT]))
+            .order_by(Content.id)
+            .limit(batch_size)
+        ).all()
+        if not contents:
+            return indexed
+
+        compressed_ids = [content.id for content in contents if content.text_storage == COMPRESSED]
+        bodies = dict(db.execute(
+            select(ContentText.content_id, ContentText.data).where(ContentText.content_id.in_(compressed_ids))
+        ).all()) if compressed_ids else {}
+
+        params = []
+        for content in contents:
+            if content.text_storage == COMPRESSED:
+                if content.id not in bodies:
+                    continue
+                body = decode_text(bodies[content.id], content.storage_codec)
+            else:
+                try:
+                    body = load_object_text(minio_service, content)
+                except S3Error as e:
+                    print(f"Skipping {content.id}: {e}")
+                    continue
+            params.append({"content_id": content.id, "body": body[:SEARCH_BODY_CHARS]})
+
+        if params:
+            db.execute(statement, params)
+            db.commit()
+
+        indexed += len(params)
+        last_id = contents[-1].id
+        print(f"Indexed {indexed} text clips")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index the full text of out-of-row text clips")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        indexed = reindex(db, args.batch_size)
+    finally:
+        db.close()
+    print(f"Done, {indexed} text clips indexed")
+
+
+if __name__ == "__main__":
+    main()
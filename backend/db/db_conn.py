@@ -1,17 +1,53 @@
 import os
 from utils import Base
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Async drivers for each backend DATABASE_URL may point at
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in DATABASE_URL for its async counterpart"""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() in ("aiosqlite", "asyncpg"):
+        return url.render_as_string(hide_password=False)
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def _connect_args(url: str) -> dict:
+    # SQLite connections are shared across threads; other drivers reject the flag
+    return {"check_same_thread": False} if url.startswith("sqlite") else {}
+
+
+# Sync engine for migrations and maintenance scripts
 engine = create_engine(DATABASE_URL,
-                       connect_args={"check_same_thread": False},
+                       connect_args=_connect_args(DATABASE_URL),
                        pool_pre_ping=True)
 SessionLocal = sessionmaker(autocommit=False,
                             autoflush=False,
                             bind=engine)
 
+# Async engine used by the API
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL,
+                                   pool_pre_ping=True)
+AsyncSessionLocal = async_sessionmaker(async_engine,
+                                       autoflush=False,
+                                       expire_on_commit=False,
+                                       class_=AsyncSession)
 
 
 def get_db():
@@ -20,3 +56,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,11 +1,10 @@
 import enum
 import uuid
-from datetime import datetime, timezone
 
-from sqlalchemy import Column, String, DateTime, Boolean, Text, func, Integer, ForeignKey, BigInteger, Enum
+from sqlalchemy import Column, String, DateTime, Boolean, Text, func, Integer, ForeignKey, BigInteger, Enum, Index, LargeBinary, UniqueConstraint
 from sqlalchemy.orm import relationship
 
-from utils import Base
+from utils import Base, utcnow
 
 
 class ContentType(enum.Enum):
@@ -13,6 +12,11 @@ class ContentType(enum.Enum):
     TEXT = "text"
 
 
+class ContentStatus(enum.Enum):
+    READY = "ready"
+    PENDING = "pending"  # Waiting for a direct-to-storage upload to land
+
+
 class User(Base):
     __tablename__ = "users"
 
@@ -21,9 +25,10 @@ class User(Base):
     phone_number = Column(String, unique=True, index=True)
     is_phone_verified = Column(Boolean, default=False)
     is_active = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
-                        onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow,
+                        onupdate=utcnow)
+    content_seq = Column(BigInteger, nullable=False, default=0, server_default="0")  # Last change number handed out, see ChangeService
     # Relationships
     contents = relationship("Content", back_populates="user", cascade="all, delete-orphan")
 
@@ -33,6 +38,8 @@ class Content(Base):
     
     id = Column(String, primary_key=True, index=True)
     content_type = Column(Enum(ContentType), nullable=False)
+    status = Column(Enum(ContentStatus), nullable=False, default=ContentStatus.READY,
+                    server_default=ContentStatus.READY.name)
     title = Column(String, nullable=True)  # Optional title for content
     tags = Column(Text, nullable=True)  # JSON string for tags
 
@@ -42,6 +49,10 @@ class Content(Base):
     
     # Text content fields
     text_content = Column(Text, nullable=True)  # For storing long text
+    text_hash = Column(String(64), nullable=True)  # SHA-256 of the normalized text, for duplicate detection
+    text_storage = Column(String, nullable=True)  # inline (or NULL) / compressed / object, see TextStoreService
+    text_preview = Column(Text, nullable=True)  # Leading part of text kept out of the row, for search
+    text_snippet = Column(String, nullable=True)  # Short start of the text shown in list summaries
     
     # File content fields
     filename = Column(String, nullable=True)  # Stored filename
@@ -50,15 +61,75 @@ class Content(Base):
     file_path = Column(String, nullable=True)  # Full file path
     file_size = Column(BigInteger, nullable=True)  # File size in bytes
     mime_type = Column(String, nullable=True)  # MIME type
+    blob_id = Column(Integer, ForeignKey("content_blobs.id"), nullable=True)  # Shared stored object, if deduplicated
+    storage_codec = Column(String, nullable=True)  # gzip / zstd when the stored object is compressed
+    change_seq = Column(BigInteger, nullable=True)  # Owner's change number of the last visible change
 
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
-                        onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow,
+                        onupdate=utcnow)
 
     def __repr__(self):
         return f"<Content(id={self.id}, type={self.content_type}, title={self.title})>"
 
 
+# Serves keyset pagination of a user's content, newest first
+Index("ix_contents_user_created_id", Content.user_id, Content.created_at.desc(), Content.id)
+# Finds an existing copy of a text clip
+Index("ix_contents_user_text_hash", Content.user_id, Content.text_hash)
+# Serves the change feed
+Index("ix_contents_user_change_seq", Content.user_id, Content.change_seq)
+
+
+class ContentBlob(Base):
+    """A stored object identified by its SHA-256, shared by every content row of a user with the same bytes"""
+    __tablename__ = "content_blobs"
+    __table_args__ = (UniqueConstraint("user_id", "sha256", name="uq_content_blobs_user_sha256"),)
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    sha256 = Column(String(64), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    bucket = Column(String, nullable=False)
+    object_name = Column(String, nullable=False)
+    storage_codec = Column(String, nullable=True)
+    ref_count = Column(Integer, nullable=False, default=1, server_default="1")
+    created_at = Column(DateTime, default=utcnow)
+
+
+class ContentText(Base):
+    """Compressed body of a medium-sized text clip, kept out of the contents table"""
+    __tablename__ = "content_texts"
+
+    content_id = Column(String, ForeignKey("contents.id", ondelete="CASCADE"), primary_key=True)
+    data = Column(LargeBinary, nullable=False)
+
+
+class ContentTombstone(Base):
+    """Marker left by a deleted content row so the change feed can report the delete"""
+    __tablename__ = "content_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    content_id = Column(String, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
+    deleted_at = Column(DateTime, default=utcnow)
+
+
+Index("ix_content_tombstones_user_change_seq", ContentTombstone.user_id, ContentTombstone.change_seq)
+
+
+class UserContentStats(Base):
+    """Per-user usage counters, updated in the same transaction as content writes"""
+    __tablename__ = "user_content_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    text_count = Column(Integer, nullable=False, default=0, server_default="0")
+    file_count = Column(Integer, nullable=False, default=0, server_default="0")
+    total_bytes = Column(BigInteger, nullable=False, default=0, server_default="0")
+    last_modified = Column(DateTime, nullable=True)
+
+
 # Legacy model for backward compatibility - can be removed later
 class FileMetadata(Base):
     __tablename__ = "file_metadata"
@@ -73,6 +144,6 @@ class FileMetadata(Base):
     content_type = Column(String, nullable=False)
     tags = Column(Text, nullable=True)
     uploaded_by = Column(String, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc),
-                        onupdate=lambda: datetime.now(timezone.utc))
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow,
+                        onupdate=utcnow)
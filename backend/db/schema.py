@@ -38,11 +38,13 @@ class ContentResponse(BaseModel):
     id: str
     content_type: ContentTypeEnum
     title: Optional[str]
+    tags: Optional[List[str]] = None
     created_at: datetime
     updated_at: datetime
     
     # Text fields
     text_content: Optional[str] = None
+    preview: Optional[str] = None  # Start of the text; list summaries return this instead of text_content
     
     # File fields
     filename: Optional[str] = None
@@ -57,7 +59,121 @@ class ContentResponse(BaseModel):
 
 class ContentListResponse(BaseModel):
     contents: List[ContentResponse]
-    total_count: int
+    total_count: Optional[int] = None  # Only counted when include_total=true
+    next_cursor: Optional[str] = None
+
+class ContentChangesResponse(BaseModel):
+    changes: List[ContentResponse]  # Current state of items added or modified since the cursor
+    deleted: List[str]  # Ids of items deleted since the cursor
+    cursor: int  # Pass as since on the next call
+    has_more: bool
+
+class ContentSearchResult(ContentResponse):
+    rank: float
+    snippet: Optional[str] = None  # HTML-escaped, matches wrapped in <mark>
+
+class ContentSearchResponse(BaseModel):
+    results: List[ContentSearchResult]
+
+class ContentNameMatch(BaseModel):
+    id: str
+    content_type: ContentTypeEnum
+    title: Optional[str] = None
+    original_name: Optional[str] = None
+    mime_type: Optional[str] = None
+    created_at: datetime
+
+class ContentNameSearchResponse(BaseModel):
+    results: List[ContentNameMatch]
+
+class ContentPrecheckRequest(BaseModel):
+    sha256: str = Field(..., pattern=r"^[0-9a-fA-F]{64}$")
+    size: int = Field(..., ge=0)
+    filename: str
+    mime_type: Optional[str] = None
+    title: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+class ContentPrecheckResponse(BaseModel):
+    exists: bool
+    content: Optional[ContentResponse] = None  # Created from the existing blob when exists is true
+
+class BatchUploadItemResult(BaseModel):
+    index: int  # Position in the request: files first, then text items
+    content_type: ContentTypeEnum
+    name: Optional[str] = None  # File name, for files
+    success: bool
+    content: Optional[ContentResponse] = None
+    error: Optional[str] = None
+
+class BatchUploadResponse(BaseModel):
+    results: List[BatchUploadItemResult]
+    files_uploaded: int  # Items stored, files and text alike
+    failed: int
+
+class BulkDeleteRequest(BaseModel):
+    # Either explicit ids...
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    # ...or a filter; at least one of these is required
+    content_type: Optional[ContentTypeEnum] = None
+    older_than: Optional[datetime] = None  # created before this time
+
+class BulkDeleteItemResult(BaseModel):
+    id: str
+    deleted: bool
+    error: Optional[str] = None
+
+class BulkDeleteResponse(BaseModel):
+    results: List[BulkDeleteItemResult]
+    deleted: int
+
+class ContentArchiveRequest(BaseModel):
+    # Either explicit ids...
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    # ...or a creation time window; no filter at all means every file
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+class UploadSessionCreate(BaseModel):
+    filename: str
+    mime_type: Optional[str] = None
+    total_size: Optional[int] = None
+    title: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+class UploadPartResponse(BaseModel):
+    part_number: int
+    etag: str
+    size: int
+
+class UploadSessionResponse(BaseModel):
+    session_id: str
+    filename: str
+    mime_type: Optional[str] = None
+    total_size: Optional[int] = None
+    part_size: int
+    max_part_size: int
+    parts: List[UploadPartResponse] = []
+    received_bytes: int = 0
+
+class PresignedUploadRequest(BaseModel):
+    filename: str
+    mime_type: Optional[str] = None
+    file_size: Optional[int] = None
+    title: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+class PresignedUploadResponse(BaseModel):
+    content_id: str
+    upload_url: str
+    method: str = "PUT"
+    headers: dict = {}
+    expires_in: int
+
+class PresignedDownloadResponse(BaseModel):
+    content_id: str
+    download_url: str
+    expires_in: int
 
 class ContentUpdateRequest(BaseModel):
     title: Optional[str] = None
@@ -0,0 +1,13 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# INSERT constructs that support ON CONFLICT, per database backend
+UPSERTS = {
+    "postgresql": pg_insert,
+    "sqlite": sqlite_insert,
+}
+
+
+def upsert(db, model):
+    """INSERT ... ON CONFLICT statement for model on the session's database"""
+    return UPSERTS[db.bind.dialect.name](model)
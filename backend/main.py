@@ -1,6 +1,8 @@
 import os
 import sys
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
+from starlette.requests import Request
 from starlette.responses import HTMLResponse
 
 load_dotenv('.env')
@@ -8,16 +10,32 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from apis.routers import api_router
+from utils.minio_conn import init_minio_service, close_minio_service
+from db.db_conn import async_engine
+from utils.compression import CompressionMiddleware, PrecompressedAsset
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled MinIO client per worker process
+    init_minio_service()
+    # Read and compressed once instead of on every hit
+    app.state.landing_page = PrecompressedAsset("landing.html", "text/html; charset=utf-8")
+    yield
+    close_minio_service()
+    await async_engine.dispose()
+
+
 # FastAPI app
 app = FastAPI(
     title="LocalVault API",
     description="Secure local file sharing and content management system with polymorphic content support",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -29,6 +47,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli for text-like responses, negotiated per request
+app.add_middleware(CompressionMiddleware)
+
 
 # Include routers
 app.include_router(api_router)
@@ -66,9 +87,8 @@ app.include_router(api_router)
 
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
-    with open("landing.html", "r") as f:
-        return HTMLResponse(content=f.read())
+async def root(request: Request):
+    return request.app.state.landing_page.response(request.headers)
 
 if __name__ == "__main__":
     import uvicorn
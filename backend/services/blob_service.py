@@ -0,0 +1,65 @@
+from typing import Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import ContentBlob
+from db.upsert import upsert
+from utils import utcnow
+
+
+class BlobService:
+    @staticmethod
+    async def find(db: AsyncSession, user_id: int, sha256: str) -> Optional[ContentBlob]:
+        return await db.scalar(select(ContentBlob).where(
+            ContentBlob.user_id == user_id,
+            ContentBlob.sha256 == sha256
+        ))
+
+    @staticmethod
+    async def attach(db: AsyncSession, user_id: int, sha256: str, size: int,
+                     bucket: str, object_name: str, storage_codec: Optional[str] = None):
+        """
+        Take a reference on the user's blob for these bytes. If there is none yet,
+        object_name becomes the blob. Returns the (id, bucket, object_name, storage_codec) to use.
+        """
+        statement = upsert(db, ContentBlob).values(
+            user_id=user_id,
+            sha256=sha256,
+            size=size,
+            bucket=bucket,
+            object_name=object_name,
+            storage_codec=storage_codec,
+            ref_count=1,
+            created_at=utcnow()
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[ContentBlob.user_id, ContentBlob.sha256],
+            set_={"ref_count": ContentBlob.ref_count + 1}
+        ).returning(ContentBlob.id, ContentBlob.bucket, ContentBlob.object_name, ContentBlob.storage_codec)
+        return (await db.execute(statement)).one()
+
+    @staticmethod
+    async def add_reference(db: AsyncSession, blob_id: int) -> bool:
+        """Take another reference on an existing blob; False if it was released meanwhile"""
+        result = await db.execute(
+            update(ContentBlob).where(ContentBlob.id == blob_id).values(ref_count=ContentBlob.ref_count + 1)
+        )
+        return result.rowcount == 1
+
+    @staticmethod
+    async def release(db: AsyncSession, blob_id: int, references: int = 1) -> Optional[Tuple[str, str]]:
+        """
+        Drop references (one per deleted content row). When none are left the blob row is
+        deleted and its (bucket, object_name) returned so the caller can remove the object after commit.
+        """
+        row = (await db.execute(
+            update(ContentBlob).where(ContentBlob.id == blob_id)
+            .values(ref_count=ContentBlob.ref_count - references)
+            .returning(ContentBlob.ref_count, ContentBlob.bucket, ContentBlob.object_name)
+        )).one_or_none()
+        if row is None or row.ref_count > 0:
+            return None
+
+        await db.execute(delete(ContentBlob).where(ContentBlob.id == blob_id))
+        return row.bucket, row.object_name
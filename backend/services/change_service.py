@@ -0,0 +1,48 @@
+from typing import Iterable, List, Sequence
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Content, ContentStatus, ContentTombstone, User
+from utils import utcnow
+
+
+class ChangeService:
+    """
+    Each user's content changes are numbered 1, 2, 3, ... by users.content_seq.
+    The counter is bumped with an UPDATE in the writer's transaction, so concurrent
+    writers of one user queue on that row and commit in change-number order:
+    a client that has seen change N never misses a later commit below N.
+    """
+
+    @staticmethod
+    async def next_sequence(db: AsyncSession, user_id: int, count: int = 1) -> int:
+        """Reserve count change numbers for user_id; returns the last of them"""
+        return await db.scalar(
+            update(User).where(User.id == user_id)
+            .values(content_seq=User.content_seq + count)
+            .returning(User.content_seq)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def record_changed(db: AsyncSession, user_id: int, contents: Sequence[Content]):
+        """Number rows that were just added or modified; flushed with the caller's transaction"""
+        if not contents:
+            return
+        last = await ChangeService.next_sequence(db, user_id, len(contents))
+        for seq, content in enumerate(contents, start=last - len(contents) + 1):
+            content.change_seq = seq
+
+    @staticmethod
+    async def record_deleted(db: AsyncSession, user_id: int, contents: Iterable[Content]):
+        """Leave tombstones for ready rows being deleted; pending rows were never listed"""
+        content_ids: List[str] = [content.id for content in contents if content.status == ContentStatus.READY]
+        if not content_ids:
+            return
+        last = await ChangeService.next_sequence(db, user_id, len(content_ids))
+        deleted_at = utcnow()
+        await db.execute(insert(ContentTombstone), [
+            {"user_id": user_id, "content_id": content_id, "change_seq": seq, "deleted_at": deleted_at}
+            for seq, content_id in enumerate(content_ids, start=last - len(content_ids) + 1)
+        ])
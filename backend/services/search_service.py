@@ -0,0 +1,215 @@
+import html
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import String, case, false, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Content, ContentStatus, ContentType
+
+# Text search configuration used by the Postgres search_vector column
+PG_TS_CONFIG = "english"
+
+# Private-use markers survive html escaping and are swapped for <mark> afterwards
+HIGHLIGHT_START = "\ue000"
+HIGHLIGHT_STOP = "\ue001"
+SNIPPET_TOKENS = 16
+
+# The trigram index can only serve terms of at least this many characters
+MIN_TRIGRAM_TERM = 3
+
+# Characters of a clip's text that are indexed, well below the 1MB tsvector limit
+SEARCH_BODY_CHARS = 262144
+
+# Bodies kept out of the row are indexed from the full text at write time
+PG_INDEX_BODY_SQL = f"UPDATE contents SET text_vector = to_tsvector('{PG_TS_CONFIG}', :body) WHERE id = :content_id"
+SQLITE_INDEX_BODY_SQL = """
+    UPDATE contents_fts SET text_content = :body
+    WHERE contents_fts MATCH 'content_id:"' || :content_id || '"'
+"""
+
+PG_SEARCH_SQL = f"""
+    WITH query AS (SELECT websearch_to_tsquery('{PG_TS_CONFIG}', :term) AS q),
+    ranked AS (
+        SELECT contents.id, ts_rank_cd(contents.search_vector, query.q) AS rank
+        FROM contents, query
+        WHERE contents.user_id = :user_id
+          AND contents.status = :status
+          {{type_filter}}
+          AND contents.search_vector @@ query.q
+        ORDER BY rank DESC, contents.created_at DESC
+        LIMIT :limit
+    )
+    SELECT ranked.id, ranked.rank,
+           ts_headline('{PG_TS_CONFIG}',
+                       concat_ws(' ', contents.title, contents.original_name, left(coalesce(contents.text_content, contents.text_preview), 100000)),
+                       query.q,
+                       'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxWords={SNIPPET_TOKENS}, MinWords=5, MaxFragments=2') AS snippet
+    FROM ranked JOIN contents ON contents.id = ranked.id, query
+    ORDER BY ranked.rank DESC
+"""
+
+# bm25 weights follow the contents_fts column order: content_id, title, original_name, text_content, user_id
+SQLITE_SEARCH_SQL = f"""
+    SELECT contents.id,
+           -bm25(contents_fts, 0.0, 10.0, 5.0, 1.0, 0.0) AS rank,
+           snippet(contents_fts, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_STOP}', '…', {SNIPPET_TOKENS}) AS snippet
+    FROM contents_fts JOIN contents ON contents.id = contents_fts.content_id
+    WHERE contents_fts MATCH :term
+      AND contents_fts.user_id = :user_id
+      AND contents.status = :status
+      {{type_filter}}
+    ORDER BY rank DESC
+    LIMIT :limit
+"""
+
+
+def fts5_query(term: str) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match in a searchable column"""
+    words = re.findall(r"\w+", term)
+    if not words:
+        return None
+    phrases = " ".join(f'"{word}"' for word in words)
+    return f"{{title original_name text_content}} : ({phrases})"
+
+
+def like_pattern(term: str, prefix: bool = False) -> str:
+    """ILIKE pattern matching term literally, as a substring or a prefix"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%" if prefix else f"%{escaped}%"
+
+
+def render_snippet(snippet: Optional[str]) -> Optional[str]:
+    """Escape a snippet and turn the highlight markers into <mark> tags"""
+    if not snippet:
+        return None
+    return html.escape(snippet).replace(HIGHLIGHT_START, "<mark>").replace(HIGHLIGHT_STOP, "</mark>")
+
+
+class SearchService:
+    @staticmethod
+    def dialect(db: AsyncSession) -> str:
+        return db.bind.dialect.name
+
+    @staticmethod
+    def match_filter(db: AsyncSession, term: str, user_id: int):
+        """WHERE clause restricting contents to rows matching term through the full-text index"""
+        dialect = SearchService.dialect(db)
+        if dialect == "postgresql":
+            return text(
+                f"contents.search_vector @@ websearch_to_tsquery('{PG_TS_CONFIG}', :search_term)"
+            ).bindparams(search_term=term)
+        if dialect == "sqlite":
+            query = fts5_query(term)
+            if not query:
+                return false()
+            matches = text(
+                "SELECT content_id FROM contents_fts WHERE contents_fts MATCH :search_term AND user_id = :search_user"
+            ).bindparams(search_term=query, search_user=user_id).columns(content_id=String)
+            return Content.id.in_(matches)
+
+        return SearchService.like_filter(term)
+
+    @staticmethod
+    def index_body_statement(dialect: str):
+        """Statement indexing a clip's full text, or None where search reads only the row"""
+        if dialect == "postgresql":
+            return text(PG_INDEX_BODY_SQL)
+        if dialect == "sqlite":
+            return text(SQLITE_INDEX_BODY_SQL)
+        return None
+
+    @staticmethod
+    async def index_body(db: AsyncSession, content_id: str, body: str):
+        """Index the full text of a flushed clip whose body is not in contents.text_content"""
+        statement = SearchService.index_body_statement(SearchService.dialect(db))
+        if statement is not None:
+            await db.execute(statement, {"content_id": content_id, "body": body[:SEARCH_BODY_CHARS]})
+
+    @staticmethod
+    def like_filter(term: str):
+        """Substring match on title, text and file name, for databases without a full-text index"""
+        pattern = like_pattern(term)
+        return or_(Content.title.ilike(pattern, escape="\\"),
+                   Content.text_content.ilike(pattern, escape="\\"),
+                   Content.text_preview.ilike(pattern, escape="\\"),
+                   Content.original_name.ilike(pattern, escape="\\"))
+
+    @staticmethod
+    async def search(db: AsyncSession, term: str, user_id: int,
+                     content_type: Optional[ContentType] = None,
+                     limit: int = 20) -> List[Tuple[Content, float, Optional[str]]]:
+        """Ranked full-text search returning (content, rank, highlighted snippet), best first"""
+        dialect = SearchService.dialect(db)
+        params = {
+            "user_id": user_id,
+            "status": ContentStatus.READY.name,
+            "limit": limit,
+        }
+        type_filter = ""
+        if content_type:
+            type_filter = "AND contents.content_type = :content_type"
+            params["content_type"] = content_type.name
+
+        if dialect == "postgresql":
+            rows = (await db.execute(text(PG_SEARCH_SQL.format(type_filter=type_filter)), {**params, "term": term})).all()
+        elif dialect == "sqlite":
+            query = fts5_query(term)
+            if not query:
+                return []
+            rows = (await db.execute(text(SQLITE_SEARCH_SQL.format(type_filter=type_filter)), {**params, "term": query})).all()
+        else:
+            # No full-text index to rank with: newest substring matches, unranked and without snippets
+            query = select(Content).where(
+                Content.user_id == user_id,
+                Content.status == ContentStatus.READY,
+                SearchService.like_filter(term)
+            )
+            if content_type:
+                query = query.where(Content.content_type == content_type)
+            contents = await db.scalars(query.order_by(Content.created_at.desc()).limit(limit))
+            return [(content, 0.0, None) for content in contents]
+
+        if not rows:
+            return []
+
+        contents = await db.scalars(select(Content).where(Content.id.in_([row.id for row in rows])))
+        by_id = {content.id: content for content in contents}
+        return [(by_id[row.id], float(row.rank), render_snippet(row.snippet))
+                for row in rows if row.id in by_id]
+
+    @staticmethod
+    def name_filter(db: AsyncSession, term: str, user_id: int):
+        """WHERE clause for a substring match on title or original name, served by the trigram index"""
+        if SearchService.dialect(db) == "sqlite" and len(term) >= MIN_TRIGRAM_TERM:
+            phrase = term.replace('"', '""')
+            matches = text(
+                "SELECT content_id FROM contents_names WHERE contents_names MATCH :name_term AND user_id = :name_user"
+            ).bindparams(
+                name_term=f'{{title original_name}} : "{phrase}"', name_user=user_id
+            ).columns(content_id=String)
+            return Content.id.in_(matches)
+
+        # Postgres pg_trgm GIN indexes serve ILIKE directly; short terms scan the user's rows
+        pattern = like_pattern(term)
+        return or_(Content.title.ilike(pattern, escape="\\"),
+                   Content.original_name.ilike(pattern, escape="\\"))
+
+    @staticmethod
+    async def search_names(db: AsyncSession, term: str, user_id: int, limit: int = 10):
+        """Type-ahead lookup by partial title or file name; prefix matches first, then newest"""
+        prefix = like_pattern(term, prefix=True)
+        prefix_first = case(
+            (Content.original_name.ilike(prefix, escape="\\"), 0),
+            (Content.title.ilike(prefix, escape="\\"), 0),
+            else_=1
+        )
+        query = select(
+            Content.id, Content.content_type, Content.title, Content.original_name,
+            Content.mime_type, Content.created_at
+        ).where(
+            Content.user_id == user_id,
+            Content.status == ContentStatus.READY,
+            SearchService.name_filter(db, term, user_id)
+        ).order_by(prefix_first, Content.created_at.desc()).limit(limit)
+        return (await db.execute(query)).all()
@@ -0,0 +1,110 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from db.models import Content, ContentStatus, ContentType, UserContentStats
+from db.upsert import upsert
+from utils import utcnow
+
+
+def content_delta(content: Content, sign: int = 1) -> dict:
+    """Counter changes caused by adding (sign=1) or removing (sign=-1) one content row"""
+    if content.content_type == ContentType.FILE:
+        return {"text_count": 0, "file_count": sign, "total_bytes": sign * (content.file_size or 0)}
+    return {"text_count": sign, "file_count": 0, "total_bytes": 0}
+
+
+def stats_from_contents(user_id: Optional[int] = None):
+    """SELECT recomputing every counter from the contents table"""
+    is_file = Content.content_type == ContentType.FILE
+    query = select(
+        Content.user_id,
+        func.sum(case((Content.content_type == ContentType.TEXT, 1), else_=0)),
+        func.sum(case((is_file, 1), else_=0)),
+        func.coalesce(func.sum(case((is_file, Content.file_size), else_=0)), 0),
+        func.max(func.coalesce(Content.updated_at, Content.created_at))
+    ).where(
+        Content.user_id.is_not(None),
+        Content.status == ContentStatus.READY
+    ).group_by(Content.user_id)
+    if user_id is not None:
+        query = query.where(Content.user_id == user_id)
+    return query
+
+
+class ContentStatsService:
+    @staticmethod
+    async def apply_delta(db: AsyncSession, user_id: int, text_count: int = 0,
+                          file_count: int = 0, total_bytes: int = 0):
+        """Adjust a user's counters atomically; flushed with the caller's transaction"""
+        values = {
+            "user_id": user_id,
+            "text_count": text_count,
+            "file_count": file_count,
+            "total_bytes": total_bytes,
+            "last_modified": utcnow(),
+        }
+        statement = upsert(db, UserContentStats).values(**values)
+        await db.execute(statement.on_conflict_do_update(
+            index_elements=[UserContentStats.user_id],
+            set_={
+                "text_count": UserContentStats.text_count + statement.excluded.text_count,
+                "file_count": UserContentStats.file_count + statement.excluded.file_count,
+                "total_bytes": UserContentStats.total_bytes + statement.excluded.total_bytes,
+                "last_modified": statement.excluded.last_modified,
+            }
+        ))
+
+    @staticmethod
+    async def record_added(db: AsyncSession, content: Content):
+        """Count a content row that just became visible (READY)"""
+        await ContentStatsService.apply_delta(db, content.user_id, **content_delta(content))
+
+    @staticmethod
+    async def record_added_many(db: AsyncSession, user_id: int, contents: Iterable[Content]):
+        """Count several new rows of one user with a single upsert"""
+        totals = {"text_count": 0, "file_count": 0, "total_bytes": 0}
+        for content in contents:
+            for key, value in content_delta(content).items():
+                totals[key] += value
+        if any(totals.values()):
+            await ContentStatsService.apply_delta(db, user_id, **totals)
+
+    @staticmethod
+    async def record_removed(db: AsyncSession, content: Content):
+        """Uncount a content row being deleted; pending rows were never counted"""
+        if content.status != ContentStatus.READY:
+            return
+        await ContentStatsService.apply_delta(db, content.user_id, **content_delta(content, sign=-1))
+
+    @staticmethod
+    async def record_removed_many(db: AsyncSession, user_id: int, contents: Iterable[Content]):
+        """Uncount several deleted rows of one user with a single upsert"""
+        totals = {"text_count": 0, "file_count": 0, "total_bytes": 0}
+        for content in contents:
+            if content.status != ContentStatus.READY:
+                continue
+            for key, value in content_delta(content, sign=-1).items():
+                totals[key] += value
+        if any(totals.values()):
+            await ContentStatsService.apply_delta(db, user_id, **totals)
+
+    @staticmethod
+    async def get_stats(db: AsyncSession, user_id: int) -> Optional[UserContentStats]:
+        return await db.get(UserContentStats, user_id)
+
+    @staticmethod
+    def rebuild(db: Session, user_id: Optional[int] = None) -> int:
+        """Recompute counters from contents for one user or everyone; returns rows written"""
+        clear = delete(UserContentStats)
+        if user_id is not None:
+            clear = clear.where(UserContentStats.user_id == user_id)
+        db.execute(clear)
+        result = db.execute(insert(UserContentStats).from_select(
+            ["user_id", "text_count", "file_count", "total_bytes", "last_modified"],
+            stats_from_contents(user_id)
+        ))
+        db.commit()
+        return result.rowcount
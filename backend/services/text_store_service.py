@@ -0,0 +1,149 @@
+import io
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.models import Content, ContentText
+from services.search_service import SearchService
+from utils.executor import run_storage
+from utils.minio_conn import get_minio_service, stream_object
+from utils.storage_codec import choose_codec, compress_bytes, decode_chunks, decompress_bytes
+
+# Where a text clip's body lives
+INLINE = "inline"  # contents.text_content
+COMPRESSED = "compressed"  # content_texts.data, compressed with storage_codec
+OBJECT = "object"  # a .txt object in the user's bucket
+
+# Tier boundaries, in UTF-8 bytes
+TEXT_INLINE_MAX_BYTES = int(os.getenv("TEXT_INLINE_MAX_BYTES", 8 * 1024))
+TEXT_OBJECT_MIN_BYTES = int(os.getenv("TEXT_OBJECT_MIN_BYTES", 256 * 1024))
+# Characters of a non-inline clip kept on the row for substring search; the
+# full-text index gets the whole body from SearchService.index_body
+TEXT_PREVIEW_CHARS = int(os.getenv("TEXT_PREVIEW_CHARS", 2048))
+# Characters of every clip returned by summary listings
+TEXT_SNIPPET_CHARS = 200
+
+
+def text_tier(size: int) -> str:
+    if size <= TEXT_INLINE_MAX_BYTES:
+        return INLINE
+    if size < TEXT_OBJECT_MIN_BYTES:
+        return COMPRESSED
+    return OBJECT
+
+
+def decode_text(data: bytes, codec: Optional[str]) -> str:
+    if codec:
+        data = decompress_bytes(data, codec)
+    return data.decode("utf-8")
+
+
+class TextStoreService:
+    @staticmethod
+    async def store(db: AsyncSession, content: Content, text: str, bucket: str):
+        """
+        Put text in the tier its size calls for and fill in content's storage fields.
+        Adds content to the session; the caller commits.
+        """
+        data = text.encode("utf-8")
+        content.file_size = len(data)
+        content.text_storage = text_tier(len(data))
+        content.text_snippet = text[:TEXT_SNIPPET_CHARS]
+
+        if content.text_storage == INLINE:
+            content.text_content = text
+            db.add(content)
+            return
+
+        content.text_preview = text[:TEXT_PREVIEW_CHARS]
+        content.storage_codec = choose_codec("text/plain", len(data))
+        if content.storage_codec:
+            data = compress_bytes(data, content.storage_codec)
+
+        if content.text_storage == COMPRESSED:
+            db.add(content)
+            await db.flush()  # the body row and the index entry reference the content row
+            db.add(ContentText(content_id=content.id, data=data))
+            await SearchService.index_body(db, content.id, text)
+            return
+
+        minio_service = get_minio_service()
+        object_name = f"{content.id}.txt"
+
+        def put_text(bucket_name):
+            minio_service.client.put_object(bucket_name, object_name, io.BytesIO(data), len(data),
+                                            content_type="text/plain",
+                                            metadata={"Content-Encoding": content.storage_codec} if content.storage_codec else None)
+            return bucket_name
+
+        bucket_name = await run_storage(minio_service.with_user_bucket, bucket, put_text)
+        content.bucket = bucket_name
+        content.filename = object_name
+        content.file_path = f"{bucket}/{object_name}"
+        db.add(content)
+        await db.flush()
+        await SearchService.index_body(db, content.id, text)
+
+    @staticmethod
+    async def load(db: AsyncSession, content: Content) -> Optional[str]:
+        """The full text of a clip, whichever tier it is in"""
+        tier = content.text_storage or INLINE
+        if tier == INLINE:
+            return content.text_content
+
+        if tier == COMPRESSED:
+            data = await db.scalar(select(ContentText.data).where(ContentText.content_id == content.id))
+            return decode_text(data, content.storage_codec) if data is not None else None
+
+        chunks = stream_object(get_minio_service(), content.bucket, content.filename)
+        if content.storage_codec:
+            chunks = decode_chunks(chunks, content.storage_codec)
+        return b"".join([chunk async for chunk in chunks]).decode("utf-8")
+
+    @staticmethod
+    async def load_many(db: AsyncSession, contents: Iterable[Content]) -> Dict[str, str]:
+        """Texts of the inline and compressed clips among contents, by id, in one query"""
+        texts = {}
+        compressed = {}
+        for content in contents:
+            tier = content.text_storage or INLINE
+            if tier == INLINE and content.text_content is not None:
+                texts[content.id] = content.text_content
+            elif tier == COMPRESSED:
+                compressed[content.id] = content.storage_codec
+
+        if compressed:
+            rows = await db.execute(
+                select(ContentText.content_id, ContentText.data).where(ContentText.content_id.in_(compressed))
+            )
+            for content_id, data in rows:
+                texts[content_id] = decode_text(data, compressed[content_id])
+        return texts
+
+    @staticmethod
+    async def discard(db: AsyncSession, content: Content) -> Optional[Tuple[str, str]]:
+        """
+        Drop a clip's out-of-row body along with it. Returns the (bucket, object_name)
+        to remove after commit for clips stored in MinIO.
+        """
+        if content.text_storage == COMPRESSED:
+            await db.execute(delete(ContentText).where(ContentText.content_id == content.id))
+        elif content.text_storage == OBJECT and content.bucket and content.filename:
+            return content.bucket, content.filename
+        return None
+
+    @staticmethod
+    async def discard_many(db: AsyncSession, contents: Iterable[Content]) -> List[Tuple[str, str]]:
+        """discard for several clips: one DELETE for the compressed bodies, MinIO objects returned"""
+        compressed = []
+        objects = []
+        for content in contents:
+            if content.text_storage == COMPRESSED:
+                compressed.append(content.id)
+            elif content.text_storage == OBJECT and content.bucket and content.filename:
+                objects.append((content.bucket, content.filename))
+        if compressed:
+            await db.execute(delete(ContentText).where(ContentText.content_id.in_(compressed)))
+        return objects
@@ -0,0 +1,84 @@
+from typing import Optional, Dict
+import logging
+
+from utils.redis_helper import RedisHelper
+
+logger = logging.getLogger(__name__)
+
+# Sessions that see no activity for a day are dropped; their MinIO uploads are
+# aborted by commands.abort_stale_uploads
+UPLOAD_SESSION_TTL = 24 * 60 * 60
+
+
+def _session_key(session_id: str) -> str:
+    return f"upload_session:{session_id}"
+
+
+def _parts_key(session_id: str) -> str:
+    return f"upload_session:{session_id}:parts"
+
+
+def _completing_key(session_id: str) -> str:
+    return f"upload_session:{session_id}:completing"
+
+
+class UploadSessionService:
+    """Resumable upload session state, kept in Redis next to a MinIO multipart upload"""
+
+    @staticmethod
+    def create_session(session_id: str, session: Dict) -> Dict:
+        """Store a new session"""
+        RedisHelper().set_hash(_session_key(session_id), session, expire=UPLOAD_SESSION_TTL)
+        return session
+
+    @staticmethod
+    def get_session(session_id: str, user_id: int) -> Optional[Dict]:
+        """Get a session if it exists and belongs to the user"""
+        session = RedisHelper().get_hash_all(_session_key(session_id))
+        if not session or session.get("user_id") != str(user_id):
+            return None
+        return session
+
+    @staticmethod
+    def session_exists(session_id: str) -> bool:
+        return bool(RedisHelper().exists(_session_key(session_id)))
+
+    @staticmethod
+    def record_part(session_id: str, part_number: int, etag: str, size: int):
+        """Record a received part and keep the session alive"""
+        redis_helper = RedisHelper()
+        redis_helper.set_hash_field(_parts_key(session_id), str(part_number), f"{etag}:{size}")
+        redis_helper.expire(_parts_key(session_id), UPLOAD_SESSION_TTL)
+        redis_helper.expire(_session_key(session_id), UPLOAD_SESSION_TTL)
+
+    @staticmethod
+    def get_parts(session_id: str) -> Dict[int, Dict]:
+        """Get received parts as {part_number: {"etag", "size"}}"""
+        raw_parts = RedisHelper().get_hash_all(_parts_key(session_id))
+        parts = {}
+        for part_number, value in raw_parts.items():
+            etag, size = value.rsplit(":", 1)
+            parts[int(part_number)] = {"etag": etag, "size": int(size)}
+        return dict(sorted(parts.items()))
+
+    @staticmethod
+    def claim_completion(session_id: str) -> bool:
+        """Mark the session as being completed; False if another request already is"""
+        return RedisHelper().set_if_absent(_completing_key(session_id), 1, expire=UPLOAD_SESSION_TTL)
+
+    @staticmethod
+    def is_completing(session_id: str) -> bool:
+        return bool(RedisHelper().exists(_completing_key(session_id)))
+
+    @staticmethod
+    def release_completion(session_id: str):
+        """Let the session be completed again after a failed attempt"""
+        RedisHelper().delete(_completing_key(session_id))
+
+    @staticmethod
+    def delete_session(session_id: str):
+        """Drop a finished or aborted session"""
+        redis_helper = RedisHelper()
+        redis_helper.delete(_parts_key(session_id))
+        redis_helper.delete(_session_key(session_id))
+        redis_helper.delete(_completing_key(session_id))
@@ -1,5 +1,7 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.models import User
+from utils.principal_cache import principal_cache
 from typing import Optional
 import logging
 
@@ -7,17 +9,16 @@ logger = logging.getLogger(__name__)
 
 class UserService:
     @staticmethod
-    def create_user_by_phone_number(phone_number: str, db: Session) -> Optional[User]:
+    async def create_user_by_phone_number(phone_number: str, db: AsyncSession) -> Optional[User]:
         """Create or get user by phone number"""
         try:
             # Check if user already exists
-            existing_user = db.query(User).filter(User.phone_number == phone_number).first()
+            existing_user = await db.scalar(select(User).where(User.phone_number == phone_number))
             if existing_user:
-                # Update verification status
+                # Update verification status; a deactivated user stays deactivated
                 existing_user.is_phone_verified = True
-                existing_user.is_active = True
-                db.commit()
-                db.refresh(existing_user)
+                await db.commit()
+                await db.refresh(existing_user)
                 return existing_user
             
             # Create new user
@@ -28,32 +29,32 @@ class UserService:
             )
             
             db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
+            await db.commit()
+            await db.refresh(new_user)
             
             logger.info(f"New user created with phone: {phone_number}")
             return new_user
             
         except Exception as e:
             logger.error(f"Error creating user: {e}")
-            db.rollback()
+            await db.rollback()
             return None
     
     @staticmethod
-    def get_user_by_phone(phone_number: str, db: Session) -> Optional[User]:
+    async def get_user_by_phone(phone_number: str, db: AsyncSession) -> Optional[User]:
         """Get user by phone number"""
-        return db.query(User).filter(User.phone_number == phone_number).first()
+        return await db.scalar(select(User).where(User.phone_number == phone_number))
     
     @staticmethod
-    def get_user_by_id(user_id: int, db: Session) -> Optional[User]:
+    async def get_user_by_id(user_id: int, db: AsyncSession) -> Optional[User]:
         """Get user by ID"""
-        return db.query(User).filter(User.id == user_id).first()
+        return await db.get(User, user_id)
     
     @staticmethod
-    def update_user_profile(user_id: int, name: str = None, email: str = None, db: Session = None) -> Optional[User]:
+    async def update_user_profile(user_id: int, name: str = None, email: str = None, db: AsyncSession = None) -> Optional[User]:
         """Update user profile information"""
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = await db.get(User, user_id)
             if not user:
                 return None
             
@@ -63,11 +64,47 @@ class UserService:
                 user.email = email
                 user.is_email_verified = False  # Reset email verification
             
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
             return user
             
         except Exception as e:
             logger.error(f"Error updating user profile: {e}")
-            db.rollback()
+            await db.rollback()
+            return None
+
+    @staticmethod
+    async def deactivate_user(user_id: int, db: AsyncSession) -> Optional[User]:
+        """Deactivate a user and drop their cached logins"""
+        try:
+            user = await db.get(User, user_id)
+            if not user:
+                return None
+
+            user.is_active = False
+            await db.commit()
+            await db.refresh(user)
+        except Exception as e:
+            logger.error(f"Error deactivating user: {e}")
+            await db.rollback()
+            return None
+
+        await principal_cache.invalidate_user(user_id)
+        return user
+
+    @staticmethod
+    async def activate_user(user_id: int, db: AsyncSession) -> Optional[User]:
+        """Let a deactivated user log in again"""
+        try:
+            user = await db.get(User, user_id)
+            if not user:
+                return None
+
+            user.is_active = True
+            await db.commit()
+            await db.refresh(user)
+            return user
+        except Exception as e:
+            logger.error(f"Error activating user: {e}")
+            await db.rollback()
             return None
@@ -0,0 +1,91 @@
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from utils.compression import CompressionMiddleware, PrecompressedAsset, compress
+from utils.http_range import is_not_modified, quote_etag
+
+BODY = b"clipboard text " * 200
+ETAG = "abc123"
+
+
+async def resource(request):
+    headers = {"ETag": quote_etag(ETAG)}
+    if is_not_modified(request.headers, ETAG, None):
+        return Response(status_code=304, headers=headers)
+    return Response(BODY, media_type="text/plain", headers=headers)
+
+
+async def ranged(request):
+    return Response(BODY, media_type="text/plain", headers={"ETag": quote_etag(ETAG), "Accept-Ranges": "bytes"})
+
+
+async def self_encoded(request):
+    # Like a compressed object passed through by download_file
+    headers = {"ETag": quote_etag(f"{ETAG}-gzip"), "Content-Encoding": "gzip"}
+    if is_not_modified(request.headers, f"{ETAG}-gzip", None):
+        return Response(status_code=304, headers=headers)
+    return Response(compress(BODY, "gzip"), media_type="text/plain", headers=headers)
+
+
+async def asset(request):
+    return request.app.state.asset.response(request.headers)
+
+
+app = Starlette(routes=[
+    Route("/resource", resource), Route("/ranged", ranged), Route("/self-encoded", self_encoded), Route("/asset", asset)
+])
+app.state.asset = PrecompressedAsset("landing.html", "text/html; charset=utf-8")
+app.add_middleware(CompressionMiddleware)
+client = TestClient(app)
+
+
+def test_encoded_etag_round_trip_gives_304():
+    first = client.get("/resource", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"] == '"abc123-gzip"'
+
+    again = client.get("/resource", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == '"abc123-gzip"'
+
+
+def test_identity_etag_still_matches():
+    first = client.get("/resource", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in first.headers
+    again = client.get("/resource", headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == '"abc123"'
+
+
+def test_ranged_responses_keep_their_validator():
+    response = client.get("/ranged", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc123"'
+    assert response.content == BODY
+
+
+def test_other_coding_etag_does_not_match():
+    first = client.get("/resource", headers={"Accept-Encoding": "gzip"})
+    again = client.get("/resource", headers={"Accept-Encoding": "identity", "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 200
+    assert again.content == BODY
+
+
+def test_app_encoded_etag_reaches_the_app():
+    first = client.get("/self-encoded", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["etag"] == '"abc123-gzip"'
+    assert first.content == BODY
+
+    again = client.get("/self-encoded", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == '"abc123-gzip"'
+
+
+def test_precompressed_asset_round_trip():
+    first = client.get("/asset", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    again = client.get("/asset", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
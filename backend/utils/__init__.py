@@ -1,2 +1,16 @@
+from datetime import datetime, timezone
+
 from sqlalchemy.ext.declarative import declarative_base
 Base = declarative_base()
+
+
+def utcnow() -> datetime:
+    """Current time as naive UTC, the form DateTime columns store (asyncpg rejects aware values for them)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def naive_utc(value: datetime) -> datetime:
+    """value as naive UTC; naive values are taken to be UTC already"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -5,6 +5,7 @@ import random
 import string
 import jwt
 import re
+import unicodedata
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict
 from db.models import User
@@ -39,6 +40,19 @@ def sanitize_title(title):
 
     return title or "Text Content"
 
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of a text clip: NFC, LF line endings, no trailing whitespace
+    on any line or at the end. Leading whitespace and blank lines are kept, so
+    clips that differ in indentation stay distinct.
+    """
+    text = unicodedata.normalize("NFC", text).replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).rstrip()
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the normalized text, equal for clips that differ only in trailing whitespace or line endings"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
 def generate_otp(identifier, otp_type="mobile_verification"):
     try:
         return True
@@ -116,7 +130,7 @@ def decode_jwt(token: str):
         return False, "Wrong token. Please login gain.", {}
 
 
-def verify_user_from_token(token: str, db) -> Optional[Dict]:
+async def verify_user_from_token(token: str, db) -> Optional[Dict]:
     """Verifies user from JWT token"""
     is_verified = False
     user = None
@@ -128,17 +142,26 @@ def verify_user_from_token(token: str, db) -> Optional[Dict]:
         user_id = payload.get("user_id")
         hashed_mobile = payload.get("phone_number")
 
-        user = UserService.get_user_by_id(user_id, db)
+        user = await UserService.get_user_by_id(user_id, db)
 
         if not user or hash_mobile_number(user.phone_number) != hashed_mobile:
             logger.debug("not user or mobile hash doesnt match")
             return is_verified, "Mobile hash doesn't match", user
+        if not user.is_active:
+            return is_verified, "User is inactive", user
         is_verified = True
         return is_verified, "User verified", user
     except Exception as e:
         app_logger.exceptionlogs(f"Error in verify user from token, Error: {e}")
         return False, "Error occurred", None
 
+def token_expiry(token: str) -> Optional[float]:
+    """Expiry timestamp of a token that has already been verified"""
+    try:
+        return jwt.decode(token, options={"verify_signature": False}).get("exp")
+    except jwt.InvalidTokenError:
+        return None
+
 def generate_random_string(length: int = 32) -> str:
     """Generate random string for various purposes"""
     return ''.join(random.choices(string.ascii_letters + string.digits, k=length))
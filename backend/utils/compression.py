@@ -0,0 +1,204 @@
+import hashlib
+import os
+import zlib
+from typing import Dict, Optional, Sequence
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip needs only the standard library
+    brotli = None
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from utils.http_range import etag_matches, is_not_modified, quote_etag
+from utils.storage_codec import GZIP, encoding_qualities, is_compressible
+
+BROTLI = "br"
+
+# Smaller bodies go out as is; compressing them costs more than it saves
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", 1024))
+# Per-request levels favour speed; precompressed assets always use the maximum
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 5))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", 4))
+
+# Offered in order of preference when the client ranks them equally
+AVAILABLE_ENCODINGS = (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+# Statuses whose bodies must not be re-encoded
+SKIP_STATUSES = {204, 206, 304}
+
+
+def negotiate_encoding(accept_encoding: Optional[str], offered: Sequence[str] = AVAILABLE_ENCODINGS) -> Optional[str]:
+    """The offered coding the client ranks highest (q > 0), or None for identity"""
+    qualities = encoding_qualities(accept_encoding)
+    best, best_quality = None, 0.0
+    for coding in offered:
+        quality = qualities.get(coding, qualities.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class _Encoder:
+    """Incremental gzip/brotli encoder; each chunk is flushed so streamed bodies keep flowing"""
+
+    def __init__(self, encoding: str, level: Optional[int] = None):
+        self.encoding = encoding
+        if encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=RESPONSE_BROTLI_QUALITY if level is None else level)
+        else:
+            self._zlib = zlib.compressobj(RESPONSE_GZIP_LEVEL if level is None else level, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == BROTLI:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def compress(data: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    encoder = _Encoder(encoding, level)
+    return encoder.chunk(data) + encoder.finish()
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Distinct validator for an encoded representation of the same resource"""
+    weak = etag.startswith("W/")
+    value = quote_etag(etag[2:] if weak else etag)
+    return f'{"W/" if weak else ""}{value[:-1]}-{encoding}"'
+
+
+def should_compress(status: int, headers: Headers) -> bool:
+    if status < 200 or status in SKIP_STATUSES:
+        return False
+    # Already encoded (e.g. a compressed object passed through), or a byte range of the identity body
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    # Resumable with Range / If-Range, which only works on the identity body the validator names
+    if headers.get("accept-ranges", "").lower() == "bytes":
+        return False
+    if "no-transform" in headers.get("cache-control", "").lower():
+        return False
+    return is_compressible(headers.get("content-type"))
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the client's preferred coding (brotli when installed, gzip)
+    when the type is text-like and the body is at least minimum_size bytes.
+    """
+
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding"))
+        if_none_match = request_headers.get("if-none-match")
+        start = None
+        encoder = None
+        not_modified = False
+
+        async def send_compressed(message):
+            nonlocal start, encoder, not_modified
+            if not_modified:
+                # The rest of a body the client already has
+                return
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether compression pays off
+                start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(raw=start["headers"])
+                eligible = should_compress(start["status"], headers)
+                if eligible:
+                    headers.add_vary_header("Accept-Encoding")
+
+                declared = headers.get("content-length")
+                too_small = (not more_body and len(body) < self.minimum_size) or (
+                    declared is not None and declared.isdigit() and int(declared) < self.minimum_size
+                )
+                if not eligible or encoding is None or too_small:
+                    await send(start)
+                    await send(message)
+                    start = None
+                    return
+
+                if "etag" in headers:
+                    headers["ETag"] = encoded_etag(headers["etag"], encoding)
+                    # The app only knows the identity tag, so an If-None-Match naming the tag
+                    # added here is answered here. Routes that encode themselves never get this far
+                    etag = headers["etag"]
+                    if if_none_match and etag_matches(if_none_match, etag[2:] if etag.startswith("W/") else etag):
+                        del headers["Content-Length"]
+                        del headers["Content-Type"]
+                        await send(dict(start, status=304))
+                        await send({"type": "http.response.body", "body": b""})
+                        not_modified = more_body
+                        return
+
+                encoder = _Encoder(encoding)
+                headers["Content-Encoding"] = encoding
+                del headers["Content-Length"]
+                if not more_body:
+                    body = encoder.chunk(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start)
+
+            data = encoder.chunk(body) if body else b""
+            if not more_body:
+                data += encoder.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class PrecompressedAsset:
+    """A static file read once and compressed ahead of time in every available coding"""
+
+    def __init__(self, path: str, media_type: str, cache_control: str = "public, max-age=3600"):
+        with open(path, "rb") as f:
+            self.body = f.read()
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self.variants: Dict[str, bytes] = {
+            GZIP: compress(self.body, GZIP, level=9),
+        }
+        if brotli is not None:
+            self.variants[BROTLI] = compress(self.body, BROTLI, level=11)
+
+    def response(self, headers: Headers) -> Response:
+        encoding = negotiate_encoding(headers.get("accept-encoding"), tuple(self.variants))
+        etag = f"{self.etag}-{encoding}" if encoding else self.etag
+        response_headers = {
+            "ETag": quote_etag(etag),
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if is_not_modified(headers, etag, None):
+            return Response(status_code=304, headers=response_headers)
+        if encoding:
+            response_headers["Content-Encoding"] = encoding
+            return Response(self.variants[encoding], media_type=self.media_type, headers=response_headers)
+        return Response(self.body, media_type=self.media_type, headers=response_headers)
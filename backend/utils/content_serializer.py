@@ -0,0 +1,74 @@
+"""
+Content payloads built straight from ORM rows and rendered with orjson.
+
+Handlers return these as ORJSONResponse, so FastAPI neither re-validates them
+against response_model (kept for the OpenAPI schema) nor runs jsonable_encoder.
+"""
+from typing import Iterable, List, Optional, Sequence
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+from db.models import Content, ContentType
+
+
+def tags_from_column(raw: Optional[str]) -> Optional[List[str]]:
+    """Tags column (JSON list, or comma-separated from older clients) as a list"""
+    if not raw:
+        return None
+    if raw.startswith("["):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            return [raw]
+    return [tag.strip() for tag in raw.split(",") if tag.strip()]
+
+
+# ContentResponse fields in schema order
+CONTENT_FIELDS = (
+    "id", "content_type", "title", "tags", "created_at", "updated_at", "text_content", "preview",
+    "filename", "original_name", "bucket", "file_size", "mime_type", "download_url",
+)
+SUMMARY_FIELDS = tuple(name for name in CONTENT_FIELDS if name != "text_content")
+
+
+def serialize_contents(contents: Iterable[Content], fields: Sequence[str] = CONTENT_FIELDS,
+                       texts: Optional[dict] = None) -> List[dict]:
+    """The given fields of each row; texts maps content id to its hydrated text"""
+    texts = texts or {}
+    with_tags = "tags" in fields
+    projected = tuple(fields) != CONTENT_FIELDS
+    items = []
+    for content in contents:
+        # Loaded columns sit in the instance __dict__: reading them there skips attribute
+        # instrumentation, and a column left out by load_only reads as None instead of lazy loading
+        values = content.__dict__
+        content_id = values["id"]
+        content_type = values.get("content_type")
+        item = {
+            "id": content_id,
+            "content_type": content_type.value if content_type else None,
+            "title": values.get("title"),
+            "tags": tags_from_column(values.get("tags")) if with_tags else None,
+            "created_at": values.get("created_at"),
+            "updated_at": values.get("updated_at"),
+            "text_content": texts.get(content_id),
+            "preview": values.get("text_snippet"),
+            "filename": values.get("filename"),
+            "original_name": values.get("original_name"),
+            "bucket": values.get("bucket"),
+            "file_size": values.get("file_size"),
+            "mime_type": values.get("mime_type"),
+            "download_url": f"/api/v1/content/download/{content_id}" if content_type == ContentType.FILE else None,
+        }
+        items.append({name: item[name] for name in fields} if projected else item)
+    return items
+
+
+def serialize_content(content: Content, text_content: Optional[str] = None) -> dict:
+    """Every ContentResponse field of one row"""
+    return serialize_contents([content], texts={content.id: text_content})[0]
+
+
+def content_response(content: Content, text_content: Optional[str] = None) -> ORJSONResponse:
+    return ORJSONResponse(serialize_content(content, text_content))
@@ -1,17 +1,23 @@
 
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .app_helper import verify_user_from_token, hash_mobile_number
-from db.db_conn import get_db
+from .app_helper import verify_user_from_token, hash_mobile_number, token_expiry
+from .principal_cache import Principal, principal_cache
+from db.db_conn import get_async_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/verify-otp")
 
 async def get_current_user(token: str = Depends(oauth2_scheme),
-                           db: Session = Depends(get_db)):
+                           db: AsyncSession = Depends(get_async_db)):
 
-    is_verified, msg, user = verify_user_from_token(token, db)
+    # Tokens verified recently skip the JWT decode, user lookup and phone hash check
+    principal = await principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    is_verified, msg, user = await verify_user_from_token(token, db)
     if not is_verified:
         raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -19,4 +25,6 @@ async def get_current_user(token: str = Depends(oauth2_scheme),
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    return user
+    principal = Principal(id=user.id, phone_number=user.phone_number)
+    await principal_cache.set(token, principal, token_expiry(token))
+    return principal
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from utils.app_logger import createLogger
+
+# Worker threads for blocking object storage / Redis calls
+STORAGE_EXECUTOR_WORKERS = int(os.getenv("STORAGE_EXECUTOR_WORKERS", 32))
+
+logger = createLogger('app')
+
+
+class BoundedExecutor:
+    """
+    Fixed-size thread pool for blocking calls made from async handlers.
+    Tracks how many calls are queued and running and how long they wait.
+    """
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _call(self, fn, enqueued_at):
+        started_at = time.monotonic()
+        waited = started_at - enqueued_at
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        try:
+            return fn()
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.total_run_seconds += time.monotonic() - started_at
+
+    def _forget_if_cancelled(self, future):
+        # A call can only be cancelled while still queued, so _call never took it off the queue
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking callable on the pool and await its result"""
+        with self._lock:
+            self.queued += 1
+        future = self._executor.submit(self._call, partial(fn, *args, **kwargs), time.monotonic())
+        future.add_done_callback(self._forget_if_cancelled)
+        # Cancelling the awaiting task cancels the pool call too if it has not started
+        return await asyncio.wrap_future(future)
+
+    def stats(self):
+        with self._lock:
+            completed = self.completed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "running": self.running,
+                "completed": completed,
+                "avg_wait_ms": round(self.total_wait_seconds * 1000 / completed, 3) if completed else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+                "avg_run_ms": round(self.total_run_seconds * 1000 / completed, 3) if completed else 0.0,
+            }
+
+
+storage_executor = BoundedExecutor("storage", STORAGE_EXECUTOR_WORKERS)
+
+
+async def run_storage(fn, *args, **kwargs):
+    """Run a blocking MinIO or Redis call off the event loop"""
+    return await storage_executor.run(fn, *args, **kwargs)
+
+
+def executor_stats():
+    return {executor.name: executor.stats() for executor in (storage_executor,)}
@@ -0,0 +1,139 @@
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import List, Optional, Tuple
+
+# Guard against requests that ask for many tiny ranges of the same object
+MAX_RANGES = 16
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when none of the requested byte ranges overlap the object"""
+
+
+def quote_etag(etag: str) -> str:
+    return f'"{etag.strip(chr(34))}"'
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match / If-Range header against an etag"""
+    if header.strip() == "*":
+        return True
+    wanted = quote_etag(etag)
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def not_modified_since(header: str, last_modified: Optional[datetime]) -> bool:
+    """True when If-Modified-Since is at or after the object's last modification"""
+    if not last_modified:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates only carry whole seconds
+    return last_modified.replace(microsecond=0) <= since
+
+
+def is_not_modified(headers, etag: str, last_modified: Optional[datetime]) -> bool:
+    """Evaluate If-None-Match, falling back to If-Modified-Since as RFC 9110 requires"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+def range_applies(headers, etag: str, last_modified: Optional[datetime]) -> bool:
+    """If-Range: only honour Range when the client's copy is still current"""
+    if_range = headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Weak validators never match for If-Range
+        return not if_range.startswith("W/") and if_range == quote_etag(etag)
+    if not last_modified:
+        return False
+    try:
+        return parsedate_to_datetime(if_range) == last_modified.replace(microsecond=0)
+    except (TypeError, ValueError):
+        return False
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[List[Tuple[int, int]]]:
+    """
+    Parse a `Range: bytes=...` header into inclusive (start, end) pairs.
+
+    Returns None when the header is absent or malformed, meaning the whole
+    object should be sent. Raises RangeNotSatisfiable when every range falls
+    outside the object.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return None
+
+    ranges = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        if not dash:
+            return None
+        try:
+            if first:
+                start = int(first)
+                end = int(last) if last else size - 1
+                if last and start > end:
+                    return None
+            else:
+                # Suffix range: the final N bytes
+                suffix = int(last)
+                if suffix == 0:
+                    continue
+                start = max(size - suffix, 0)
+                end = size - 1
+        except ValueError:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+    if len(ranges) > MAX_RANGES:
+        return None
+    return ranges
+
+
+def multipart_byteranges(ranges: List[Tuple[int, int]], size: int, media_type: str, boundary: str):
+    """Part headers for a multipart/byteranges body, plus the total body length"""
+    part_headers = []
+    total = 0
+    for start, end in ranges:
+        header = (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode("latin-1")
+        part_headers.append(header)
+        total += len(header) + (end - start + 1)
+    closing = f"\r\n--{boundary}--\r\n".encode("latin-1")
+    total += len(closing)
+    return part_headers, closing, total
@@ -1,33 +1,251 @@
 import os
 import re
+import time
+import threading
+from datetime import timedelta
+from typing import Optional
+
+import certifi
+import urllib3
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util import Retry, Timeout
 from minio import Minio, S3Error
+from minio.datatypes import Part
+from minio.deleteobjects import DeleteObject
+from redis.exceptions import RedisError
 
 from utils.app_logger import createLogger
+from utils.executor import run_storage
+from utils.redis_helper import RedisHelper
 
 MINIO_ENDPOINT = os.getenv("MINIO_ENDPOINT")
 MINIO_ACCESS_KEY = os.getenv("MINIO_ACCESS_KEY")
 MINIO_SECRET_KEY = os.getenv("MINIO_SECRET_KEY")
 
-# minio_client = Minio(
-#     MINIO_ENDPOINT,
-#     access_key=MINIO_ACCESS_KEY,
-#     secret_key=MINIO_SECRET_KEY,
-#     secure=False  # Set to True if using HTTPS
-# )
+# Host clients use to reach MinIO directly; presigned URLs are signed for it
+MINIO_PUBLIC_ENDPOINT = os.getenv("MINIO_PUBLIC_ENDPOINT", MINIO_ENDPOINT)
+MINIO_PUBLIC_SECURE = os.getenv("MINIO_PUBLIC_SECURE", "false").lower() == "true"
+PRESIGNED_URL_EXPIRY = timedelta(seconds=int(os.getenv("PRESIGNED_URL_EXPIRY_SECONDS", 900)))
+
+# Connection pool shared by every request in the process
+MINIO_POOL_MAXSIZE = int(os.getenv("MINIO_POOL_MAXSIZE", 32))
+MINIO_POOL_BLOCK = os.getenv("MINIO_POOL_BLOCK", "true").lower() == "true"
+MINIO_CONNECT_TIMEOUT = float(os.getenv("MINIO_CONNECT_TIMEOUT", 5))
+MINIO_READ_TIMEOUT = float(os.getenv("MINIO_READ_TIMEOUT", 60))
+MINIO_RETRIES = int(os.getenv("MINIO_RETRIES", 3))
+
+# Known-bucket cache; the Redis tier shares it across workers
+BUCKET_CACHE_REDIS = os.getenv("BUCKET_CACHE_REDIS", "false").lower() == "true"
+BUCKET_CACHE_TTL = int(os.getenv("BUCKET_CACHE_TTL", 24 * 60 * 60))
+
+# Each download read is one executor hop, so read in larger chunks
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
 
 logger = createLogger('app')
 
+
+class PoolStats:
+    """Connection counters shared by all pools of one PoolManager"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.total_wait_seconds = 0.0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "created": self.created,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "avg_wait_ms": round(self.total_wait_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+            }
+
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats
+
+    def _new_conn(self):
+        with self.stats._lock:
+            self.stats.created += 1
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        with self.stats._lock:
+            self.stats.waiting += 1
+        started = time.monotonic()
+        try:
+            conn = super()._get_conn(timeout=timeout)
+        finally:
+            with self.stats._lock:
+                self.stats.waiting -= 1
+                self.stats.total_wait_seconds += time.monotonic() - started
+        with self.stats._lock:
+            self.stats.in_use += 1
+            self.stats.checkouts += 1
+        return conn
+
+    def _put_conn(self, conn):
+        with self.stats._lock:
+            self.stats.in_use -= 1
+        return super()._put_conn(conn)
+
+
+class InstrumentedPoolManager(urllib3.PoolManager):
+    """PoolManager whose connection pools report usage to a PoolStats"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = PoolStats()
+        stats = self.stats
+        self.pool_classes_by_scheme = {
+            "http": type("InstrumentedHTTPConnectionPool",
+                         (_InstrumentedPoolMixin, HTTPConnectionPool), {"stats": stats}),
+            "https": type("InstrumentedHTTPSConnectionPool",
+                          (_InstrumentedPoolMixin, HTTPSConnectionPool), {"stats": stats}),
+        }
+
+    def pool_stats(self):
+        return {**self.stats.snapshot(), "max_size": MINIO_POOL_MAXSIZE, "block": MINIO_POOL_BLOCK}
+
+
+def build_http_client() -> InstrumentedPoolManager:
+    """Pool for the process-wide MinIO client, configured from MINIO_POOL_* / MINIO_*_TIMEOUT / MINIO_RETRIES"""
+    return InstrumentedPoolManager(
+        maxsize=MINIO_POOL_MAXSIZE,
+        block=MINIO_POOL_BLOCK,
+        timeout=Timeout(connect=MINIO_CONNECT_TIMEOUT, read=MINIO_READ_TIMEOUT),
+        cert_reqs='CERT_REQUIRED',
+        ca_certs=os.environ.get('SSL_CERT_FILE') or certifi.where(),
+        retries=Retry(
+            total=MINIO_RETRIES,
+            backoff_factor=0.2,
+            status_forcelist=[500, 502, 503, 504]
+        )
+    )
+
+
+class MultipartUploads:
+    """
+    S3 multipart uploads, which minio-py only offers as private Minio methods
+    (_create_multipart_upload, _complete_multipart_upload, _abort_multipart_upload,
+    _list_multipart_uploads).
+    They are confined to this class and were checked against minio==7.2.16, the
+    version pinned in requirements.txt: re-check these calls when upgrading.
+
+    Parts go through a presigned UploadPart URL instead of _upload_part, which
+    needs the whole part as bytes; this way the body streams from a file.
+    """
+
+    def __init__(self, client: Minio, http_client: urllib3.PoolManager):
+        self.client = client
+        self.http_client = http_client
+
+    def create(self, bucket_name, object_name, content_type=None):
+        """Start a multipart upload and return its upload id"""
+        headers = {"Content-Type": content_type or "application/octet-stream"}
+        return self.client._create_multipart_upload(bucket_name, object_name, headers)
+
+    def upload_part(self, bucket_name, object_name, upload_id, part_number, source, size):
+        """Upload size bytes of a seekable file as one part and return its etag"""
+        url = self.client.get_presigned_url(
+            "PUT", bucket_name, object_name, expires=timedelta(minutes=15),
+            extra_query_params={"partNumber": str(part_number), "uploadId": upload_id}
+        )
+        # urllib3 rewinds a file body before retrying
+        response = self.http_client.request("PUT", url, body=source, headers={"Content-Length": str(size)})
+        if response.status != 200:
+            if response.data and "xml" in response.headers.get("content-type", ""):
+                raise S3Error.fromxml(response)
+            raise S3Error("UploadPartFailed", f"UploadPart returned HTTP {response.status}",
+                          object_name, None, None, response, bucket_name, object_name)
+        return response.headers.get("etag", "").replace('"', "")
+
+    def complete(self, bucket_name, object_name, upload_id, parts):
+        """Assemble the object from (part_number, etag) pairs"""
+        parts = [Part(part_number, etag) for part_number, etag in sorted(parts)]
+        return self.client._complete_multipart_upload(bucket_name, object_name, upload_id, parts)
+
+    def abort(self, bucket_name, object_name, upload_id):
+        """Abort a multipart upload and discard its uploaded parts"""
+        self.client._abort_multipart_upload(bucket_name, object_name, upload_id)
+
+    def list_incomplete(self, bucket_name):
+        """Yield (object_name, upload_id, initiated_time) for every unfinished upload in a bucket"""
+        key_marker = upload_id_marker = None
+        while True:
+            result = self.client._list_multipart_uploads(
+                bucket_name, key_marker=key_marker, upload_id_marker=upload_id_marker
+            )
+            for upload in result.uploads:
+                yield upload.object_name, upload.upload_id, upload.initiated_time
+            if not result.is_truncated:
+                return
+            key_marker, upload_id_marker = result.next_key_marker, result.next_upload_id_marker
+
+
 class MinIOService:
     def __init__(self, endpoint=MINIO_ENDPOINT,
                  access_key=MINIO_ACCESS_KEY,
-                 secret_key=MINIO_SECRET_KEY):
+                 secret_key=MINIO_SECRET_KEY,
+                 http_client: Optional[urllib3.PoolManager] = None):
+        self.http_client = http_client
         self.client = Minio(
             endpoint,
             access_key=access_key,
             secret_key=secret_key,
             secure=False,
+            region="us-east-1",
+            http_client=http_client
+        )
+        # Signing is offline, so the presign client never uses its own pool
+        self.presign_client = Minio(
+            MINIO_PUBLIC_ENDPOINT,
+            access_key=access_key,
+            secret_key=secret_key,
+            secure=MINIO_PUBLIC_SECURE,
             region="us-east-1"
         )
+        self.multipart = MultipartUploads(self.client, http_client or urllib3.PoolManager())
+        self.known_buckets = set()
+        self._known_buckets_lock = threading.Lock()
+
+    def _bucket_is_known(self, bucket_name):
+        if bucket_name in self.known_buckets:
+            return True
+        if not BUCKET_CACHE_REDIS:
+            return False
+        try:
+            if RedisHelper().exists(f"known_bucket:{bucket_name}"):
+                with self._known_buckets_lock:
+                    self.known_buckets.add(bucket_name)
+                return True
+        except RedisError as e:
+            logger.warning(f"Bucket cache unavailable in Redis: {e}")
+        return False
+
+    def _remember_bucket(self, bucket_name):
+        with self._known_buckets_lock:
+            self.known_buckets.add(bucket_name)
+        if BUCKET_CACHE_REDIS:
+            try:
+                RedisHelper().set(f"known_bucket:{bucket_name}", 1, expire=BUCKET_CACHE_TTL)
+            except RedisError as e:
+                logger.warning(f"Bucket cache unavailable in Redis: {e}")
+
+    def forget_bucket(self, bucket_name):
+        """Drop a bucket from the cache, e.g. after MinIO reports NoSuchBucket"""
+        with self._known_buckets_lock:
+            self.known_buckets.discard(bucket_name)
+        if BUCKET_CACHE_REDIS:
+            try:
+                RedisHelper().delete(f"known_bucket:{bucket_name}")
+            except RedisError as e:
+                logger.warning(f"Bucket cache unavailable in Redis: {e}")
 
     def sanitize_bucket_name(self, name):
         """
@@ -59,12 +277,21 @@ class MinIOService:
         # Sanitize phone number for bucket name
         bucket_name = f"user-{phone_number}"
 
+        # Known buckets skip the bucket_exists round-trip entirely
+        if self._bucket_is_known(bucket_name):
+            return bucket_name
+
         try:
             # Check if bucket exists
             if not self.client.bucket_exists(bucket_name):
                 # Create bucket
-                self.client.make_bucket(bucket_name)
-                logger.info(f"Created bucket: {bucket_name}")
+                try:
+                    self.client.make_bucket(bucket_name)
+                    logger.info(f"Created bucket: {bucket_name}")
+                except S3Error as e:
+                    # Another worker created it first
+                    if e.code not in ("BucketAlreadyOwnedByYou", "BucketAlreadyExists"):
+                        raise
 
                 # Set default policy (optional - makes bucket readable)
                 policy = {
@@ -81,12 +308,46 @@ class MinIOService:
                 # Uncomment if you want public read access
                 # self.client.set_bucket_policy(bucket_name, json.dumps(policy))
 
+            self._remember_bucket(bucket_name)
             return bucket_name
 
         except S3Error as e:
             logger.error(f"Error creating bucket {bucket_name}: {e}")
             raise Exception(f"Failed to create bucket: {str(e)}")
 
+    def with_user_bucket(self, phone_number, operation):
+        """
+        Run operation(bucket_name) against the user's bucket. If the bucket
+        has disappeared since it was cached, recreate it and retry once.
+        """
+        bucket_name = self.create_user_bucket(phone_number)
+        try:
+            return operation(bucket_name)
+        except S3Error as e:
+            if e.code != "NoSuchBucket":
+                raise
+            logger.warning(f"Bucket {bucket_name} missing, recreating")
+            self.forget_bucket(bucket_name)
+            bucket_name = self.create_user_bucket(phone_number)
+            return operation(bucket_name)
+
+    def remove_objects(self, objects):
+        """
+        Delete (bucket, object_name) pairs with MinIO's multi-object delete, one
+        batched request per bucket and 1000 keys. Returns the pairs that failed.
+        """
+        by_bucket = {}
+        for bucket_name, object_name in objects:
+            by_bucket.setdefault(bucket_name, []).append(object_name)
+
+        failed = []
+        for bucket_name, object_names in by_bucket.items():
+            errors = self.client.remove_objects(bucket_name, [DeleteObject(name) for name in object_names])
+            for error in errors:
+                logger.warning(f"Failed to delete {bucket_name}/{error.name}: {error.code} {error.message}")
+                failed.append((bucket_name, error.name))
+        return failed
+
     def get_or_create_bucket(self, identifier, bucket_type="user"):
         """Generic method to get or create bucket"""
         bucket_name = self.sanitize_bucket_name(f"{bucket_type}-{identifier}")
@@ -111,4 +372,69 @@ class MinIOService:
             return user_buckets
         except S3Error as e:
             logger.error(f"Error listing buckets: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def presigned_upload_url(self, bucket_name, object_name, expires=PRESIGNED_URL_EXPIRY):
+        """Short-lived URL a client can PUT the object to"""
+        return self.presign_client.presigned_put_object(bucket_name, object_name, expires=expires)
+
+    def presigned_download_url(self, bucket_name, object_name, download_name=None, expires=PRESIGNED_URL_EXPIRY):
+        """Short-lived URL a client can GET the object from"""
+        response_headers = None
+        if download_name:
+            response_headers = {
+                "response-content-disposition": f"attachment; filename*=UTF-8''{download_name}"
+            }
+        return self.presign_client.presigned_get_object(
+            bucket_name, object_name, expires=expires, response_headers=response_headers
+        )
+
+
+_minio_service: Optional[MinIOService] = None
+_minio_service_lock = threading.Lock()
+
+
+def init_minio_service() -> MinIOService:
+    """Create the process-wide MinIO client; called from the app lifespan"""
+    global _minio_service
+    with _minio_service_lock:
+        if _minio_service is None:
+            _minio_service = MinIOService(http_client=build_http_client())
+            logger.info(f"MinIO client pool ready (maxsize={MINIO_POOL_MAXSIZE})")
+        return _minio_service
+
+
+def close_minio_service():
+    """Drop pooled connections on shutdown"""
+    global _minio_service
+    with _minio_service_lock:
+        if _minio_service is not None:
+            _minio_service.http_client.clear()
+            _minio_service = None
+
+
+def get_minio_service() -> MinIOService:
+    """Shared MinIO service; created lazily outside the app (scripts, alembic)"""
+    return _minio_service or init_minio_service()
+
+
+async def iter_object_response(response):
+    """Yield the body of an open get_object response, reading off the event loop"""
+    try:
+        while True:
+            data = await run_storage(response.read, DOWNLOAD_CHUNK_SIZE)
+            if not data:
+                break
+            yield data
+    finally:
+        response.close()
+        response.release_conn()
+
+
+async def stream_object(minio_service, bucket_name, object_name, offset=0, length=0):
+    """Yield an object's bytes, or one byte range of it"""
+    response = await run_storage(
+        minio_service.client.get_object, bucket_name, object_name, offset=offset, length=length
+    )
+    async for data in iter_object_response(response):
+        yield data
@@ -0,0 +1,23 @@
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(created_at: datetime, content_id: str) -> str:
+    """Pack the (created_at, id) position of the last row into an opaque token"""
+    raw = json.dumps([created_at.isoformat(), content_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str):
+    """Unpack a token from encode_cursor back into (created_at, id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, content_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), str(content_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e))
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from redis.exceptions import RedisError
+
+from utils.app_logger import createLogger
+from utils.executor import run_storage
+from utils.redis_helper import RedisHelper
+
+# How long a verified token skips JWT decoding, the user lookup and the phone hash check.
+# Bounds how long another worker may keep serving a deactivated user from its local tier.
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+# Share verified principals across workers through Redis
+PRINCIPAL_CACHE_REDIS = os.getenv("PRINCIPAL_CACHE_REDIS", "false").lower() == "true"
+
+logger = createLogger('app')
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as seen by request handlers"""
+    id: int
+    phone_number: str
+
+
+def token_key(token: str) -> str:
+    # Raw tokens are never stored, only their hash
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class PrincipalCache:
+    """
+    TTL/LRU cache of verified principals keyed by token hash, with an optional
+    Redis tier shared across workers.
+    """
+
+    def __init__(self, max_size=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL, use_redis=PRINCIPAL_CACHE_REDIS):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.use_redis = use_redis
+        self._entries = OrderedDict()  # token hash -> (principal, expires_at)
+        self._lock = threading.Lock()
+
+    def _get_local(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def _set_local(self, key, principal, expires_at):
+        with self._lock:
+            self._entries[key] = (principal, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _get_remote(self, key):
+        """(principal, expires_at) from Redis, or None"""
+        try:
+            value = RedisHelper().get_json(f"principal:{key}")
+        except RedisError as e:
+            logger.warning(f"Principal cache unavailable in Redis: {e}")
+            return None
+        if not value or "expires_at" not in value:
+            return None
+        return Principal(id=value["id"], phone_number=value["phone_number"]), value["expires_at"]
+
+    def _set_remote(self, key, principal, ttl, expires_at):
+        try:
+            helper = RedisHelper()
+            helper.set_json(f"principal:{key}", {
+                "id": principal.id,
+                "phone_number": principal.phone_number,
+                "expires_at": expires_at,
+            }, expire=ttl)
+            # Index by user so deactivation can find every cached token
+            helper.add_to_set(f"principal_tokens:{principal.id}", key)
+            helper.expire(f"principal_tokens:{principal.id}", ttl)
+        except RedisError as e:
+            logger.warning(f"Principal cache unavailable in Redis: {e}")
+
+    def _forget_remote(self, user_id):
+        try:
+            helper = RedisHelper()
+            for key in helper.get_set_members(f"principal_tokens:{user_id}"):
+                helper.delete(f"principal:{key}")
+            helper.delete(f"principal_tokens:{user_id}")
+        except RedisError as e:
+            logger.warning(f"Principal cache unavailable in Redis: {e}")
+
+    async def get(self, token: str) -> Optional[Principal]:
+        key = token_key(token)
+        principal = self._get_local(key)
+        if principal is not None or not self.use_redis:
+            return principal
+
+        entry = await run_storage(self._get_remote, key)
+        if entry is None:
+            return None
+        # Kept locally no longer than the shared entry, so the token's expiry and
+        # an invalidation elsewhere are not pushed back by a full TTL
+        principal, expires_at = entry
+        expires_at = min(expires_at, time.time() + self.ttl)
+        if expires_at <= time.time():
+            return None
+        self._set_local(key, principal, expires_at)
+        return principal
+
+    async def set(self, token: str, principal: Principal, token_expires_at: Optional[float] = None):
+        """Cache a verified principal, never past the token's own expiry"""
+        ttl = self.ttl
+        if token_expires_at is not None:
+            ttl = min(ttl, int(token_expires_at - time.time()))
+        if ttl <= 0:
+            return
+
+        key = token_key(token)
+        expires_at = time.time() + ttl
+        self._set_local(key, principal, expires_at)
+        if self.use_redis:
+            await run_storage(self._set_remote, key, principal, ttl, expires_at)
+
+    async def invalidate_user(self, user_id: int):
+        """Drop every cached token of a user, e.g. when the user is deactivated"""
+        with self._lock:
+            for key in [key for key, (principal, _) in self._entries.items() if principal.id == user_id]:
+                del self._entries[key]
+        if self.use_redis:
+            await run_storage(self._forget_remote, user_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache()
@@ -83,4 +83,24 @@ class RedisHelper:
 
     def get_hash_field(self, key: str, field: str) -> Optional[str]:
         """Get specific hash field."""
-        return self.redis.hget(key, field)
\ No newline at end of file
+        return self.redis.hget(key, field)
+
+    def set_if_absent(self, key: str, value: Any, expire: Optional[int] = None) -> bool:
+        """Set key only if it does not exist yet; True when this call set it."""
+        return bool(self.redis.set(key, value, ex=expire, nx=True))
+
+    def set_hash_field(self, key: str, field: str, value: Any):
+        """Set a single hash field."""
+        return self.redis.hset(key, field, str(value))
+
+    def expire(self, key: str, ttl_seconds: int):
+        """Set a key's time to live in seconds."""
+        return self.redis.expire(key, ttl_seconds)
+
+    def add_to_set(self, key: str, *members: Any):
+        """Add members to a set."""
+        return self.redis.sadd(key, *members)
+
+    def get_set_members(self, key: str) -> set:
+        """Get all members of a set."""
+        return self.redis.smembers(key)
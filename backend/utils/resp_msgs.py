@@ -18,6 +18,7 @@ INVALID_OTP = "Invalid or expired OTP"
 INVALID_CREDENTIALS = "Invalid credentials"
 USER_NOT_FOUND = "User not found"
 USER_ALREADY_EXISTS = "User already exists"
+USER_INACTIVE = "User is inactive"
 PHONE_REQUIRED = "Phone number is required"
 OTP_REQUIRED = "OTP is required"
 TOKEN_EXPIRED = "Token has expired"
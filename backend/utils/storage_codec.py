@@ -0,0 +1,150 @@
+import os
+import zlib
+from typing import AsyncIterator, BinaryIO, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; gzip needs only the standard library
+    zstandard = None
+
+from utils.upload_stream import UPLOAD_PART_SIZE
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+# Codec for compressible uploads: gzip, zstd or none
+STORAGE_COMPRESSION = os.getenv("STORAGE_COMPRESSION", GZIP).lower()
+GZIP_LEVEL = int(os.getenv("STORAGE_GZIP_LEVEL", 6))
+ZSTD_LEVEL = int(os.getenv("STORAGE_ZSTD_LEVEL", 3))
+
+# Below this the codec framing outweighs the savings
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_TYPES = {
+    "application/json", "application/xml", "application/rtf", "application/javascript",
+    "application/x-sql", "application/x-shellscript", "image/svg+xml", "application/x-ndjson",
+}
+
+
+def is_compressible(mime_type: Optional[str]) -> bool:
+    if not mime_type:
+        return False
+    mime_type = mime_type.split(";")[0].strip().lower()
+    return mime_type.startswith("text/") or mime_type in COMPRESSIBLE_TYPES
+
+
+def choose_codec(mime_type: Optional[str], size: Optional[int] = None) -> Optional[str]:
+    """Codec to store an object with, or None to store it as is"""
+    if not is_compressible(mime_type):
+        return None
+    if size is not None and size < MIN_COMPRESS_SIZE:
+        return None
+    if STORAGE_COMPRESSION == ZSTD and zstandard is not None:
+        return ZSTD
+    if STORAGE_COMPRESSION in (GZIP, ZSTD):
+        return GZIP
+    return None
+
+
+def _compressor(codec: str):
+    if codec == GZIP:
+        return zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    if codec == ZSTD:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    raise ValueError(f"Unknown storage codec {codec}")
+
+
+def _decompressor(codec: str):
+    if codec == GZIP:
+        return zlib.decompressobj(31)
+    if codec == ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is not installed; cannot read zstd objects")
+        return zstandard.ZstdDecompressor().decompressobj()
+    raise ValueError(f"Unknown storage codec {codec}")
+
+
+class CompressingStream:
+    """File-like wrapper that compresses a source stream as MinIO reads it"""
+
+    def __init__(self, source: BinaryIO, codec: str):
+        self.source = source
+        self.codec = codec
+        self._compressor = _compressor(codec)
+        self._buffer = bytearray()
+        self._finished = False
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = UPLOAD_PART_SIZE
+        while len(self._buffer) < size and not self._finished:
+            data = self.source.read(UPLOAD_PART_SIZE)
+            if data:
+                self._buffer += self._compressor.compress(data)
+            else:
+                self._buffer += self._compressor.flush()
+                self._finished = True
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+
+def compress_bytes(data: bytes, codec: str) -> bytes:
+    compressor = _compressor(codec)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress_bytes(data: bytes, codec: str) -> bytes:
+    decompressor = _decompressor(codec)
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+async def decode_chunks(chunks: AsyncIterator[bytes], codec: str) -> AsyncIterator[bytes]:
+    """Decompress a stream of stored chunks as they arrive"""
+    decompressor = _decompressor(codec)
+    async for chunk in chunks:
+        data = decompressor.decompress(chunk)
+        if data:
+            yield data
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+async def slice_chunks(chunks: AsyncIterator[bytes], offset: int, length: int) -> AsyncIterator[bytes]:
+    """Bytes offset to offset + length of a chunk stream, e.g. a range of decoded content"""
+    async for chunk in chunks:
+        if offset >= len(chunk):
+            offset -= len(chunk)
+            continue
+        data = chunk[offset:offset + length]
+        offset = 0
+        length -= len(data)
+        yield data
+        if not length:
+            break
+
+
+def encoding_qualities(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Accept-Encoding as {coding: q}, codings lowercased"""
+    qualities = {}
+    if not accept_encoding:
+        return qualities
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return qualities
+
+
+def accepts_encoding(accept_encoding: Optional[str], coding: str) -> bool:
+    """Whether an Accept-Encoding header allows coding (q > 0)"""
+    qualities = encoding_qualities(accept_encoding)
+    return qualities.get(coding, qualities.get("*", 0.0)) > 0
@@ -0,0 +1,49 @@
+import hashlib
+from typing import BinaryIO
+
+from minio.helpers import MIN_PART_SIZE
+
+# MinIO reads one part at a time from the stream, so the part size is the
+# upper bound on how much of an upload sits in worker memory at once.
+UPLOAD_PART_SIZE = MIN_PART_SIZE  # 5MB
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload stream grows past its size limit"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"Upload exceeds maximum size of {max_size} bytes")
+
+
+class UploadStream:
+    """
+    File-like wrapper over an UploadFile spool that enforces a size limit
+    while MinIO consumes it, so the file is never loaded whole into memory.
+    The SHA-256 of everything read is computed along the way.
+    """
+
+    def __init__(self, source: BinaryIO, max_size: int):
+        self.source = source
+        self.max_size = max_size
+        self.bytes_read = 0
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = UPLOAD_PART_SIZE
+
+        # Ask for one byte past the limit so an oversized upload is caught
+        # here instead of after it has been written to storage.
+        allowed = self.max_size - self.bytes_read + 1
+        data = self.source.read(min(size, allowed))
+
+        self.bytes_read += len(data)
+        if self.bytes_read > self.max_size:
+            raise UploadTooLarge(self.max_size)
+        self._digest.update(data)
+        return data
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
@@ -0,0 +1,89 @@
+"""
+ZIP archives written on the fly: each entry's bytes go out as they are read,
+so memory stays flat however large the archive grows.
+
+zipfile writes to an unseekable sink in streaming mode: sizes and CRCs follow
+each entry in a data descriptor, and ZIP64 records are added when needed.
+"""
+import posixpath
+import zipfile
+from datetime import datetime
+from typing import AsyncIterator, Optional, Set
+
+from utils.storage_codec import is_compressible
+
+# Oldest timestamp a ZIP entry can carry
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+
+class _Sink:
+    """Write-only buffer the archive writes into; drained after every write"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def entry_name(name: Optional[str], fallback: str, taken: Set[str]) -> str:
+    """A flat, unique archive path for name: "report.pdf", then "report (1).pdf", ..."""
+    name = (name or "").replace("\\", "/").split("/")[-1].strip().lstrip(".") or fallback
+    stem, ext = posixpath.splitext(name)
+    candidate, n = name, 0
+    while candidate.lower() in taken:
+        n += 1
+        candidate = f"{stem} ({n}){ext}"
+    taken.add(candidate.lower())
+    return candidate
+
+
+class ZipStream:
+    """
+    Build a ZIP archive entry by entry. add() yields the encoded bytes of one
+    entry as its data arrives; close() yields the central directory.
+    """
+
+    def __init__(self):
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", allowZip64=True)
+        self._names: Set[str] = set()
+
+    async def add(self, name: str, chunks: AsyncIterator[bytes], mime_type: Optional[str] = None,
+                  size: Optional[int] = None, modified: Optional[datetime] = None,
+                  fallback: str = "file") -> AsyncIterator[bytes]:
+        """
+        Stream one entry. Already compressed media (images, video, archives, ...)
+        is stored as is; text-like types are deflated. size, when known, lets
+        small entries skip the ZIP64 extra field.
+        """
+        info = zipfile.ZipInfo(entry_name(name, fallback, self._names),
+                               max(modified.timetuple()[:6], ZIP_EPOCH) if modified else ZIP_EPOCH)
+        info.compress_type = zipfile.ZIP_DEFLATED if is_compressible(mime_type) else zipfile.ZIP_STORED
+        info.external_attr = 0o644 << 16
+        force_zip64 = size is None or size > zipfile.ZIP64_LIMIT // 2
+        if size is not None:
+            info.file_size = size
+
+        with self._zip.open(info, mode="w", force_zip64=force_zip64) as entry:
+            async for data in chunks:
+                entry.write(data)
+                out = self._sink.drain()
+                if out:
+                    yield out
+        out = self._sink.drain()  # data descriptor
+        if out:
+            yield out
+
+    def close(self) -> bytes:
+        self._zip.close()
+        return self._sink.drain()
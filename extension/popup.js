@@ -396,7 +396,7 @@ class LocalVaultExtension {
             }
 
 
-            const response = await fetch(`${this.baseUrl}/api/v1/content/upload`, {
+            const response = await fetch(`${this.baseUrl}/api/v1/content/upload/batch`, {
                 method: 'POST',
                 headers: {
                     'Authorization': `Bearer ${this.access_token}`,
@@ -406,7 +406,11 @@ class LocalVaultExtension {
 
             if (response.ok) {
                 const data = await response.json();
-                this.showStatus(`Successfully uploaded ${data.files_uploaded} item(s)!`, 'success');
+                if (data.failed > 0) {
+                    this.showStatus(`Uploaded ${data.files_uploaded} item(s), ${data.failed} failed`, 'error');
+                } else {
+                    this.showStatus(`Successfully uploaded ${data.files_uploaded} item(s)!`, 'success');
+                }
 
                 // Clear form
                 this.selectedFiles = [];
@@ -489,7 +493,7 @@ class LocalVaultExtension {
             // Add click listener (not inline onclick)
             fileDiv.addEventListener('click', () => {
                  if (file.content_type === 'text') {
-                    this.copyTextToClipboard(file.text_content);
+                    this.copyContentToClipboard(file.id);
                 } else {
                     this.downloadFile(file.id, file.original_name);
                 }
@@ -513,6 +517,26 @@ class LocalVaultExtension {
         });
     }
 
+    // List items only carry a preview, so fetch the full text before copying
+    async copyContentToClipboard(contentId) {
+        try {
+            const response = await fetch(`${this.baseUrl}/api/v1/content/${contentId}`, {
+                headers: {
+                    'Authorization': `Bearer ${this.access_token}`,
+                },
+            });
+            if (!response.ok) {
+                this.showStatus('Failed to load text', 'error');
+                return;
+            }
+            const data = await response.json();
+            await this.copyTextToClipboard(data.text_content);
+        } catch (error) {
+            console.error('Load text error:', error);
+            this.showStatus('Failed to load text', 'error');
+        }
+    }
+
     // Add this new method for copying text to clipboard
     async copyTextToClipboard(textContent) {
         try {
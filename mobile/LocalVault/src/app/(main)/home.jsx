@@ -77,7 +77,12 @@ export default function HomeScreen() {
     
     if (item.content_type === 'text') {
       // Copy text to clipboard
-      await Clipboard.setStringAsync(item.text_content);
+      const response = await ContentService.getTextContent(item.id);
+      if (!response.success) {
+        Alert.alert('Error', response.message);
+        return;
+      }
+      await Clipboard.setStringAsync(response.data);
       Alert.alert('Success', 'Text copied to clipboard!');
     } else {
       // Download file
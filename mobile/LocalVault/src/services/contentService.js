@@ -5,6 +5,7 @@ import * as Sharing from 'expo-sharing';
 class ContentService {
   constructor() {
     this.axiosInstance = null;
+    this.resetSync();
   }
 
   // Initialize with auth service axios instance
@@ -15,18 +16,61 @@ class ContentService {
     }
   }
 
-  // Get list of content from server
+  // Forget the synced items; the next getContentList fetches everything again
+  resetSync() {
+    this.items = new Map();
+    this.syncCursor = 0;
+    this.syncOwner = null;
+  }
+
+  // Get list of content from server, fetching only what changed since the last call
   async getContentList() {
     try {
       if (!this.axiosInstance) {
         await this.initialize();
       }
 
-      const response = await this.axiosInstance.get('/api/v1/content/list');
-      
+      // The cache belongs to one account on one server
+      const owner = `${AuthService.baseURL}|${AuthService.phoneNumber}`;
+      if (owner !== this.syncOwner) {
+        this.resetSync();
+        this.syncOwner = owner;
+      }
+
+      let hasMore = true;
+      while (hasMore) {
+        let response;
+        try {
+          response = await this.axiosInstance.get('/api/v1/content/changes', {
+            params: { since: this.syncCursor },
+          });
+        } catch (error) {
+          // The server no longer knows our cursor: start over
+          if (error.response?.status === 410 && this.syncCursor !== 0) {
+            this.resetSync();
+            this.syncOwner = owner;
+            continue;
+          }
+          throw error;
+        }
+
+        const { changes = [], deleted = [], cursor, has_more } = response.data;
+        changes.forEach((item) => this.items.set(item.id, item));
+        deleted.forEach((id) => this.items.delete(id));
+        this.syncCursor = cursor;
+        hasMore = has_more;
+      }
+
+      // Newest first, as /list returns them
+      const data = [...this.items.values()].sort((a, b) =>
+        a.created_at === b.created_at
+          ? a.id.localeCompare(b.id)
+          : (a.created_at < b.created_at ? 1 : -1)
+      );
+
       return {
         success: true,
-        data: response.data.contents || [],
+        data,
         message: 'Content loaded successfully',
       };
     } catch (error) {
@@ -72,16 +116,19 @@ class ContentService {
         formData.append('text_content', textContent.trim());
       }
 
-      const response = await this.axiosInstance.post('/api/v1/content/upload', formData, {
+      const response = await this.axiosInstance.post('/api/v1/content/upload/batch', formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
       });
 
+      const failed = response.data.failed || 0;
       return {
-        success: true,
+        success: failed === 0,
         data: response.data,
-        message: `Successfully uploaded ${response.data.files_uploaded || 1} item(s)`,
+        message: failed
+          ? `Uploaded ${response.data.files_uploaded} item(s), ${failed} failed`
+          : `Successfully uploaded ${response.data.files_uploaded || 1} item(s)`,
       };
     } catch (error) {
       console.error('Upload content error:', error);
@@ -138,6 +185,28 @@ class ContentService {
     }
   }
 
+  // Get full text of a clip (list items only carry a preview)
+  async getTextContent(contentId) {
+    try {
+      if (!this.axiosInstance) {
+        await this.initialize();
+      }
+
+      const response = await this.axiosInstance.get(`/api/v1/content/${contentId}`);
+
+      return {
+        success: true,
+        data: response.data.text_content,
+      };
+    } catch (error) {
+      console.error('Get text content error:', error);
+      return {
+        success: false,
+        message: error.response?.data?.detail || 'Failed to load text',
+      };
+    }
+  }
+
   // Delete content
   async deleteContent(contentId) {
     try {